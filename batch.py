@@ -0,0 +1,233 @@
+"""
+Command-line batch runner with resumable checkpoints.
+
+A job is described by a JSON (or TOML) manifest::
+
+    {
+        "database": "CEMDATA18-31-03-2022-phaseVol.dat",
+        "elements": "Al Si Ca K Mg Na S O H",
+        "inputs": [
+            {"path": "result.xlsx", "sheets": ["stabA", "stabB", "type3", "csa"]},
+            {"path": "lab_export.csv", "columns": {"Al": "Al [mol/kg]"}}
+        ],
+        "columns": {},
+        "mineral_groups": {"gyp": {"label": "Gypsum", "phases": {"Gp": 2}}},
+        "conditions": {"temperature": 25.0, "pressure": 1.0, "warm_start": "previous"},
+        "chunk_size": 10000,
+        "workers": 1,
+        "output": "results.parquet",
+        "checkpoints": "results.checkpoints"
+    }
+
+Only ``inputs`` and ``output`` are required. ``columns`` maps the names
+of ``INPUT_COLUMNS`` to the column names of the input files (per input or
+for all inputs), ``mineral_groups`` replaces ``minerals.MINERAL_GROUPS``.
+Warm starts are only available with ``"workers": 1``.
+
+Every solved chunk is written atomically to the checkpoint directory, so a
+killed or preempted run started again with the same manifest only solves
+the chunks that are missing::
+
+    python batch.py job.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import signal
+import sys
+import time
+
+import pandas as pd
+
+from cache import file_digest
+from equilibrium import (DATABASE, ELEMENTS, INPUT_COLUMNS, PRESSURE,
+                         TEMPERATURE, BatchEquilibrium)
+from ingest import CHUNK_SIZE, iter_chunks
+from minerals import MINERAL_GROUPS
+from parallel import make_pool, solve_parallel
+
+FORMATS = (".parquet", ".csv")
+
+
+def load_manifest(path):
+    """Read a JSON or TOML manifest and fill in the defaults."""
+    if path.endswith(".toml"):
+        import tomllib
+
+        with open(path, "rb") as f:
+            manifest = tomllib.load(f)
+    else:
+        with open(path) as f:
+            manifest = json.load(f)
+
+    for key in ("inputs", "output"):
+        if key not in manifest:
+            raise ValueError(f"manifest {path} has no {key!r}")
+    if os.path.splitext(manifest["output"])[1] not in FORMATS:
+        raise ValueError(f"output must be one of {FORMATS}, got {manifest['output']!r}")
+
+    manifest.setdefault("database", DATABASE)
+    manifest.setdefault("elements", ELEMENTS)
+    manifest.setdefault("columns", {})
+    manifest.setdefault("chunk_size", CHUNK_SIZE)
+    manifest.setdefault("workers", 1)
+    manifest.setdefault("checkpoints", os.path.splitext(manifest["output"])[0] + ".checkpoints")
+    conditions = manifest.setdefault("conditions", {})
+    conditions.setdefault("temperature", TEMPERATURE)
+    conditions.setdefault("pressure", PRESSURE)
+    conditions.setdefault("warm_start", None)
+    if conditions["warm_start"] is not None and manifest["workers"] > 1:
+        raise ValueError("warm_start is only supported with workers = 1, "
+                         f"got workers = {manifest['workers']}")
+    return manifest
+
+
+def mineral_groups(manifest):
+    """Mineral groups of the manifest in the ``MINERAL_GROUPS`` layout."""
+    if "mineral_groups" not in manifest:
+        return MINERAL_GROUPS
+    return {key: (group.get("label", key), group["phases"])
+            for key, group in manifest["mineral_groups"].items()}
+
+
+def fingerprint(manifest):
+    """Hash of everything in the manifest that changes the results, including the input files."""
+    relevant = {key: manifest[key] for key in ("database", "elements", "inputs", "columns",
+                                               "conditions", "chunk_size")}
+    relevant["mineral_groups"] = mineral_groups(manifest)
+    relevant["contents"] = [file_digest(path) for path in
+                            [manifest["database"]] + [item["path"] for item in manifest["inputs"]]]
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode()).hexdigest()
+
+
+def tasks(manifest):
+    """
+    ``(name, path, sheet, columns)`` of every input table of the manifest.
+    Names carry a hash of the input path, so equally named files in
+    different directories do not share checkpoints.
+    """
+    for item in manifest["inputs"]:
+        columns = {**manifest["columns"], **item.get("columns", {})}
+        path = os.path.normpath(item["path"])
+        stem = f"{os.path.splitext(os.path.basename(path))[0]}-{hashlib.sha1(path.encode()).hexdigest()[:8]}"
+        for sheet in item.get("sheets", [None]):
+            name = stem if sheet is None else f"{stem}-{sheet}"
+            yield name, item["path"], sheet, columns
+
+
+def _write(frame, path):
+    partial = path + ".partial"
+    if path.endswith(".parquet"):
+        frame.to_parquet(partial)
+    else:
+        frame.to_csv(partial)
+    os.replace(partial, path)
+
+
+def _read(path):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, index_col=[0, 1, 2])
+
+
+def prepare_checkpoints(manifest, restart=False):
+    """
+    Create the checkpoint directory, or check that an existing one belongs
+    to the same manifest.
+    """
+    directory = manifest["checkpoints"]
+    stamp = os.path.join(directory, "manifest.sha256")
+    key = fingerprint(manifest)
+
+    if restart and os.path.isdir(directory):
+        shutil.rmtree(directory)
+    if os.path.exists(stamp):
+        with open(stamp) as f:
+            if f.read().strip() != key:
+                raise SystemExit(f"{directory} holds checkpoints of a different manifest or input file, "
+                                 "use --restart to discard them")
+    else:
+        os.makedirs(directory, exist_ok=True)
+        with open(stamp, "w") as f:
+            f.write(key)
+    return directory
+
+
+def run(manifest, restart=False, log=print):
+    """Solve every chunk of every input that has no checkpoint yet and merge the output."""
+    directory = prepare_checkpoints(manifest, restart)
+    extension = os.path.splitext(manifest["output"])[1]
+    conditions = manifest["conditions"]
+    groups = mineral_groups(manifest)
+
+    engine = None
+    pool = None
+    try:
+        parts = []
+        for name, path, sheet, columns in tasks(manifest):
+            source = [columns.get(column, column) for column in INPUT_COLUMNS]
+            chunks = iter_chunks(path, sheet, manifest["chunk_size"], source)
+            for k, chunk in enumerate(chunks):
+                part = os.path.join(directory, f"{name}-{k:06d}{extension}")
+                parts.append(part)
+                if os.path.exists(part):
+                    continue
+
+                tic = time.perf_counter()
+                chunk.columns = INPUT_COLUMNS
+                if manifest["workers"] > 1:
+                    if pool is None:
+                        pool = make_pool(manifest["workers"], manifest["database"],
+                                         manifest["elements"], groups)
+                    result = solve_parallel(chunk, pool=pool, groups=groups,
+                                            temperature=conditions["temperature"],
+                                            pressure=conditions["pressure"])
+                else:
+                    if engine is None:
+                        engine = BatchEquilibrium(manifest["database"], manifest["elements"], groups=groups)
+                    result = engine.solve_frame(chunk, conditions["temperature"], conditions["pressure"],
+                                                warm_start=conditions["warm_start"])
+
+                frame = chunk.join(result, rsuffix="_solved")
+                frame.index = pd.MultiIndex.from_arrays(
+                    [[path] * len(frame), [sheet or ""] * len(frame), frame.index],
+                    names=["source", "sheet", "row"])
+                _write(frame, part)
+                log(f"{name} chunk {k}: {len(frame)} rows in {time.perf_counter() - tic:.1f} s")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    output = pd.concat([_read(part) for part in parts]) if parts else pd.DataFrame()
+    _write(output, manifest["output"])
+    log(f"wrote {len(output)} rows to {manifest['output']}")
+    return output
+
+
+def _terminate(signum, frame):
+    # Turn SIGTERM from the scheduler into a normal exit so pools are shut down;
+    # completed chunks are already checkpointed.
+    raise SystemExit(128 + signum)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve the inputs of a job manifest with checkpoints.")
+    parser.add_argument("manifest", help="JSON or TOML job manifest")
+    parser.add_argument("--output", help="override the output file of the manifest")
+    parser.add_argument("--restart", action="store_true", help="discard existing checkpoints")
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest(args.manifest)
+    if args.output:
+        manifest["output"] = args.output
+
+    signal.signal(signal.SIGTERM, _terminate)
+    run(manifest, args.restart)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""
+Benchmark of the solve and post-processing pipeline.
+
+Synthetic compositions are drawn from the ranges of the ICP sheets of
+``result.xlsx`` (log-uniform amounts, uniform pH). For every batch size the
+wall time of each stage, the solves per second, the Newton iterations per
+solve and the peak resident memory are recorded and saved as JSON, so runs
+with different Reaktoro or CEMDATA versions can be compared::
+
+    python benchmark.py --sizes 10 100 1000 --output bench.json
+    python benchmark.py --sizes 10 100 1000 --baseline bench.json
+
+``--imports`` instead checks the import time of the entry points of short
+jobs in a fresh interpreter against ``IMPORT_BUDGET``, and that they do not
+load modules they do not need (matplotlib for computing, anything heavy for
+the service client). The compute path is timed with reaktoro, which the
+first ``BatchEquilibrium`` imports anyway::
+
+    python benchmark.py --imports
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from importlib import metadata
+
+import numpy as np
+import pandas as pd
+from reaktoro import AqueousProps, PhreeqcDatabase
+
+from cache import file_digest
+from equilibrium import CURING_LABELS, DATABASE, ELEMENTS, INPUT_COLUMNS, BatchEquilibrium, build_system
+from ingest import WORKBOOK, composition_ranges
+
+SIZES = [10, 100, 1000]
+
+# Modules imported by an entry point -> (import time budget in seconds, modules
+# it must not load)
+IMPORT_BUDGET = {
+    "client": (0.15, ["numpy", "pandas", "reaktoro", "matplotlib"]),
+    "equilibrium, ingest, reaktoro": (2.0, ["matplotlib"]),
+    "batch": (1.0, ["reaktoro", "matplotlib"]),
+    "service": (1.0, ["reaktoro", "matplotlib"]),
+}
+
+
+def synthetic_compositions(n, ranges, seed=0):
+    """``n`` random ICP rows spanning ``ranges``."""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for column, (low, high) in ranges.items():
+        if column == "pH":
+            columns[column] = rng.uniform(low, high, n)
+        else:
+            columns[column] = 10 ** rng.uniform(np.log10(low), np.log10(high), n)
+    return pd.DataFrame(columns)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _version(package):
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _time_plot(groups, eff, pH):
+    """Time the pipeline's figure of one mix (the first ``CURING_LABELS`` rows)."""
+    from plotting import LINES, FigureTemplate
+
+    n = min(len(CURING_LABELS), len(pH))
+    columns = {group: eff[:n, j] for j, group in enumerate(groups)}
+    eff = {group: columns.get(group, np.full(n, np.nan)) for group in LINES}
+
+    tic = time.perf_counter()
+    FigureTemplate(CURING_LABELS[:n], headless=True).update(eff, pH[:n]).save(io.BytesIO())
+    return time.perf_counter() - tic
+
+
+def benchmark_size(engine, df, plot=True):
+    """Per-stage timings of solving and post-processing ``df``."""
+    inputs = df[INPUT_COLUMNS].to_numpy(dtype=float)
+    minerals = engine.minerals
+    stages = dict.fromkeys(["solve", "aqueous_props", "saturation_index"], 0.0)
+    iterations = np.zeros(len(inputs), dtype=int)
+    succeeded = np.zeros(len(inputs), dtype=bool)
+    phase_si = np.empty((len(inputs), len(minerals.phases)))
+
+    start = time.perf_counter()
+    for i, row in enumerate(inputs):
+        tic = time.perf_counter()
+        state, result = engine.solve_row(row)
+        toc = time.perf_counter()
+        aprops = AqueousProps(state)
+        tac = time.perf_counter()
+        minerals.phase_si(aprops, out=phase_si[i])
+        stages["solve"] += toc - tic
+        stages["aqueous_props"] += tac - toc
+        stages["saturation_index"] += time.perf_counter() - tac
+        iterations[i] = result.iterations()
+        succeeded[i] = result.succeeded()
+
+    tic = time.perf_counter()
+    si, eff = minerals.reduce(phase_si)
+    stages["reduce_groups"] = time.perf_counter() - tic
+    total = time.perf_counter() - start
+
+    if plot:
+        stages["plot"] = _time_plot(minerals.groups, eff, inputs[:, -1])
+
+    return {
+        "rows": len(inputs),
+        "stages": stages,
+        "total": total,
+        "solves_per_second": len(inputs) / stages["solve"] if stages["solve"] else None,
+        "iterations_per_solve": float(iterations.mean()),
+        "failed": int((~succeeded).sum()),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_benchmark(sizes=SIZES, database=DATABASE, elements=ELEMENTS, workbook=WORKBOOK,
+                  plot=True, seed=0):
+    """Benchmark the setup stages once and the solve pipeline for every batch size."""
+    setup = {}
+    tic = time.perf_counter()
+    db = PhreeqcDatabase().load(database)
+    setup["load_database"] = time.perf_counter() - tic
+
+    tic = time.perf_counter()
+    system = build_system(db, elements)
+    setup["build_system"] = time.perf_counter() - tic
+
+    tic = time.perf_counter()
+    engine = BatchEquilibrium(database, elements, system=system)
+    setup["build_solver"] = time.perf_counter() - tic
+
+    ranges = composition_ranges(workbook)
+    runs = [benchmark_size(engine, synthetic_compositions(n, ranges, seed), plot) for n in sizes]
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "reaktoro": _version("reaktoro"),
+            "numpy": _version("numpy"),
+            "database": database,
+            "database_sha256": file_digest(database),
+            "elements": elements,
+            "seed": seed,
+        },
+        "setup": setup,
+        "runs": runs,
+    }
+
+
+def import_time(modules, repeat=3):
+    """
+    Best wall time of ``import <modules>`` (a comma-separated list, seconds)
+    over ``repeat`` fresh interpreters, and the top-level modules it loaded.
+    """
+    code = (f"import sys, time; tic = time.perf_counter(); import {modules}; "
+            f"print(time.perf_counter() - tic); "
+            f"print(' '.join(sorted({{m.partition('.')[0] for m in sys.modules}})))")
+    best = None
+    for _ in range(repeat):
+        process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                 check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        seconds, loaded = process.stdout.split("\n", 1)
+        best = float(seconds) if best is None else min(best, float(seconds))
+    return best, set(loaded.split())
+
+
+def check_imports(budget=IMPORT_BUDGET):
+    """``{module: seconds}`` and lines describing every exceeded budget."""
+    times, violations = {}, []
+    for module, (limit, forbidden) in budget.items():
+        seconds, loaded = import_time(module)
+        times[module] = seconds
+        if seconds > limit:
+            violations.append(f"{module}: imports in {seconds:.3f} s, budget {limit:.3f} s")
+        for name in forbidden:
+            if name in loaded:
+                violations.append(f"{module}: loads {name}")
+    return times, violations
+
+
+def compare(baseline, current, tolerance=0.10, min_seconds=1e-3):
+    """
+    Lines describing the stages of ``current`` more than ``tolerance``
+    (relative) slower than in ``baseline``. Stages faster than
+    ``min_seconds`` in both runs are timing noise and ignored.
+    """
+    regressions = []
+    for stage, seconds in current["setup"].items():
+        before = baseline["setup"].get(stage)
+        if before and seconds > max(before * (1 + tolerance), min_seconds):
+            regressions.append(f"setup/{stage}: {before:.4f} s -> {seconds:.4f} s")
+
+    previous = {run["rows"]: run for run in baseline["runs"]}
+    for run in current["runs"]:
+        if run["rows"] not in previous:
+            continue
+        for stage, seconds in run["stages"].items():
+            before = previous[run["rows"]]["stages"].get(stage)
+            if before and seconds > max(before * (1 + tolerance), min_seconds):
+                regressions.append(f"{run['rows']} rows/{stage}: {before:.4f} s -> {seconds:.4f} s")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="batch sizes to benchmark (10 to 100000 rows)")
+    parser.add_argument("--database", default=DATABASE)
+    parser.add_argument("--workbook", default=WORKBOOK, help="workbook the composition ranges are taken from")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-plot", action="store_true", help="skip the plotting stage")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--imports", action="store_true", help="only check the import-time budget")
+    args = parser.parse_args(argv)
+
+    if args.imports:
+        times, violations = check_imports()
+        for module, seconds in times.items():
+            print(f"{module:<32}{seconds:10.3f} s  (budget {IMPORT_BUDGET[module][0]:.3f} s)")
+        for line in violations:
+            print("over budget:", line)
+        return 1 if violations else 0
+
+    report = run_benchmark(args.sizes, args.database, workbook=args.workbook,
+                           plot=not args.no_plot, seed=args.seed)
+
+    for stage, seconds in report["setup"].items():
+        print(f"{stage:<20}{seconds:10.3f} s")
+    for run in report["runs"]:
+        print(f"{run['rows']:>7} rows  {run['solves_per_second']:10.1f} solves/s  "
+              f"{run['iterations_per_solve']:6.1f} it/solve  {run['peak_rss_mb']:8.1f} MiB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(json.load(f), report, args.tolerance)
+        for line in regressions:
+            print("slower:", line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
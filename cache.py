@@ -0,0 +1,146 @@
+"""
+Persistent on-disk cache of equilibrium results.
+
+Results are stored in SQLite under a content-addressed key: a hash of the
+database file, the activity model, the element list and the rounded inputs
+of the row (ICP amounts, pH, temperature and pressure). ``cached_solve``
+adds the configuration of the solving engine to the key (database, species
+of its system, mineral groups, fixed conditions), so reduced, frozen or
+differently grouped engines never share records. Entries written with
+another database file are dropped when the cache is opened, and the least
+recently used entries are evicted once the cache exceeds ``max_bytes``.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from equilibrium import DATABASE, ELEMENTS, INPUT_COLUMNS, PRESSURE, TEMPERATURE
+
+CACHE = "equilibrium_cache.sqlite"
+ACTIVITY_MODEL = "ActivityModelPitzer"
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def engine_fingerprint(engine):
+    """Hash of everything about ``engine`` that changes its results."""
+    database = engine.database
+    minerals = engine.minerals
+    parts = [
+        file_digest(database) if isinstance(database, str) else type(database).__name__,
+        ACTIVITY_MODEL,
+        engine.elements,
+        " ".join(species.name() for species in engine.system.species()),
+        json.dumps([minerals.phases, minerals.divisors.tolist(), minerals.offsets.tolist()]),
+        repr(engine.fixed_conditions),
+    ]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+class ResultCache:
+    """SQLite store of one result record per distinct input row."""
+
+    def __init__(self, path=CACHE, database=DATABASE, elements=ELEMENTS,
+                 activity_model=ACTIVITY_MODEL, max_bytes=256 * 2**20, digits=6):
+        self.digits = digits
+        self.max_bytes = max_bytes
+        self.fingerprint = hashlib.sha256(
+            "\n".join([file_digest(database), activity_model, elements]).encode()).hexdigest()
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, fingerprint TEXT, value TEXT, size INTEGER, accessed REAL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        with self.connection:
+            self.connection.execute("DELETE FROM results WHERE fingerprint != ?", (self.fingerprint,))
+
+    def close(self):
+        self.connection.close()
+
+    def key(self, row, engine=""):
+        """
+        Cache key of one row of inputs, rounded to ``digits`` significant
+        digits, for the engine with fingerprint ``engine``.
+        """
+        text = ",".join(f"{value:.{self.digits}g}" for value in row)
+        return hashlib.sha256(f"{self.fingerprint}:{engine}:{text}".encode()).hexdigest()
+
+    def get_many(self, keys):
+        """Return ``{key: record}`` for the keys present in the cache."""
+        found = {}
+        for i in range(0, len(keys), 500):
+            batch = keys[i:i + 500]
+            query = f"SELECT key, value FROM results WHERE key IN ({','.join('?' * len(batch))})"
+            found.update((key, json.loads(value)) for key, value in self.connection.execute(query, batch))
+
+        if found:
+            now = time.time()
+            with self.connection:
+                self.connection.executemany("UPDATE results SET accessed = ? WHERE key = ?",
+                                            [(now, key) for key in found])
+        return found
+
+    def put_many(self, items):
+        """Store ``(key, record)`` pairs and evict least recently used entries."""
+        now = time.time()
+        rows = []
+        for key, record in items:
+            value = json.dumps(record)
+            rows.append((key, self.fingerprint, value, len(value), now))
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", rows)
+        self.evict()
+
+    def size(self):
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in ``max_bytes``."""
+        excess = self.size() - self.max_bytes
+        if excess <= 0:
+            return
+        stale = []
+        for key, size in self.connection.execute("SELECT key, size FROM results ORDER BY accessed"):
+            stale.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        with self.connection:
+            self.connection.executemany("DELETE FROM results WHERE key = ?", stale)
+
+
+def cached_solve(engine, df, cache, temperature=TEMPERATURE, pressure=PRESSURE, **kwargs):
+    """
+    Solve an ICP table through ``cache``: only rows missing from the cache
+    are passed to ``engine.solve_frame`` and stored afterwards.
+    """
+    fingerprint = engine_fingerprint(engine)
+    rows = np.empty((len(df), len(INPUT_COLUMNS) + 2))
+    rows[:, :-2] = df[INPUT_COLUMNS].to_numpy(dtype=float)
+    rows[:, -2] = temperature
+    rows[:, -1] = pressure
+    keys = [cache.key(row, fingerprint) for row in rows]
+
+    found = cache.get_many(list(set(keys)))
+    missing = [i for i, key in enumerate(keys) if key not in found]
+    if missing:
+        solved = engine.solve_frame(df.iloc[missing], temperature, pressure, **kwargs)
+        records = solved.to_dict("records")
+        # Failed solves are returned but not cached
+        cache.put_many([(keys[i], record) for i, record in zip(missing, records) if record["succeeded"]])
+        found.update((keys[i], record) for i, record in zip(missing, records))
+
+    return pd.DataFrame.from_records([found[key] for key in keys], index=df.index)
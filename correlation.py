@@ -0,0 +1,181 @@
+"""
+Correlation of the effective saturation indices with strength.
+
+``join_strength`` aligns the UCS results of every mix with its solved ICP
+samples by curing time (``STRENGTH_MINUTES`` against ``CURING_MINUTES``).
+The joined table is reshaped into ``(mix, curing time, group)`` arrays and
+Pearson and Spearman correlations and least-squares lines are computed for
+all mineral groups (and all mixes) at once:
+
+* ``strength_correlations``: one row per mineral group, pooling the samples
+  of all mixes, ranked by the strength of the correlation;
+* ``mix_correlations``: one row per mix and mineral group, over the curing
+  times of that mix.
+"""
+
+import numpy as np
+import pandas as pd
+
+from equilibrium import CURING_MINUTES, STRENGTH_MINUTES
+from ingest import STRENGTH_COLUMNS
+from minerals import MINERAL_GROUPS
+
+# Fewer pairs than this give no correlation (two points always correlate perfectly)
+MIN_PAIRS = 3
+
+METHODS = ("pearson", "spearman")
+
+
+def join_strength(results, strength, columns=STRENGTH_COLUMNS, minutes=STRENGTH_MINUTES,
+                  curing=CURING_MINUTES):
+    """
+    Effective saturation indices and relative UCS indexed by ``(mix, minutes)``.
+
+    ``results`` is indexed by ``(mix, row)`` (``BatchEquilibrium.solve_sheets``,
+    ``IncrementalResults``); the curing time of a sample is its ``minutes``
+    column or else its position within the mix in ``curing``. ``strength``
+    has one column per mix, renamed with ``columns`` (ICP sheet -> strength
+    column), and one row per curing time in ``minutes``. Only curing times
+    with both results are kept.
+    """
+    effective = [column for column in results.columns if column.endswith("_eff")]
+    mixes = results.index.get_level_values(0)
+    if "minutes" in results:
+        times = results["minutes"].to_numpy()
+    else:
+        position = results.groupby(level=0, sort=False).cumcount()
+        if len(position) and position.max() >= len(curing):
+            mix = position.index[position.to_numpy().argmax()][0]
+            raise ValueError(f"mix {mix!r} has more samples than the {len(curing)} curing times; "
+                             f"add a 'minutes' column to the results")
+        times = np.asarray(curing)[position.to_numpy()]
+    si = results[effective].set_axis(pd.MultiIndex.from_arrays([mixes, times], names=["mix", "minutes"]))
+
+    ucs = strength.iloc[:len(minutes)].rename(columns={v: k for k, v in columns.items()})
+    ucs.index = pd.Index(minutes[:len(ucs)], name="minutes")
+    ucs.columns.name = "mix"
+    ucs = ucs.stack().rename("strength").swaplevel().astype(float)
+
+    return si.join(ucs, how="inner").dropna(subset=["strength"]).sort_index()
+
+
+def _groups(joined, groups):
+    if groups is None:
+        groups = [column[:-len("_eff")] for column in joined.columns if column.endswith("_eff")]
+    return list(groups)
+
+
+def _arrays(joined, groups):
+    """``(mixes, eff[mix, time, group], strength[mix, time])`` with NaN for missing samples."""
+    mixes = joined.index.unique(level=0)
+    times = np.sort(joined.index.unique(level=1))
+    full = joined.reindex(pd.MultiIndex.from_product([mixes, times], names=joined.index.names))
+    eff = full[[f"{group}_eff" for group in groups]].to_numpy(dtype=float)
+    strength = full["strength"].to_numpy(dtype=float)
+    return mixes, eff.reshape(len(mixes), len(times), len(groups)), strength.reshape(len(mixes), len(times))
+
+
+def _ranks(values):
+    # Average ranks of every column, NaN stays NaN
+    return pd.DataFrame(values).rank(axis=0).to_numpy()
+
+
+def _pearson(x, y):
+    """Correlation and least-squares line of every column of ``x`` against ``y``."""
+    valid = ~np.isnan(x)
+    n = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_x = np.where(valid, x, 0.0).sum(axis=0) / n
+        mean_y = np.where(valid, y, 0.0).sum(axis=0) / n
+        dx = np.where(valid, x - mean_x, 0.0)
+        dy = np.where(valid, y - mean_y, 0.0)
+        cov = (dx * dy).sum(axis=0)
+        sxx = (dx * dx).sum(axis=0)
+        r = cov / np.sqrt(sxx * (dy * dy).sum(axis=0))
+        slope = cov / sxx
+    intercept = mean_y - slope * mean_x
+    few = n < MIN_PAIRS
+    r[few] = slope[few] = intercept[few] = np.nan
+    return n, r, slope, intercept
+
+
+def correlate(x, y):
+    """
+    ``{n, pearson, spearman, slope, intercept}`` of every column of ``x``
+    (samples along axis 0) against the same column of ``y``; pairs with a
+    missing value are left out.
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    missing = np.isnan(x) | np.isnan(y)
+    x = np.where(missing, np.nan, x)
+    y = np.where(missing, np.nan, y)
+
+    n, pearson, slope, intercept = _pearson(x, y)
+    spearman = _pearson(_ranks(x), _ranks(y))[1]
+    return {"n": n, "pearson": pearson, "spearman": spearman, "slope": slope, "intercept": intercept}
+
+
+def _ranked(frame, rank_by):
+    if rank_by not in METHODS:
+        raise ValueError(f"rank_by must be one of {METHODS}, got {rank_by!r}")
+    order = frame[rank_by].abs().sort_values(ascending=False, na_position="last").index
+    return frame.loc[order]
+
+
+def strength_correlations(joined, groups=None, rank_by="spearman"):
+    """
+    Correlation of each group's effective SI with strength over all samples
+    of all mixes, strongest first. ``median_mix_<rank_by>`` and
+    ``positive_mixes`` summarise the per-mix correlations of the group.
+    """
+    groups = _groups(joined, groups)
+    mixes, eff, strength = _arrays(joined, groups)
+    pooled = correlate(eff.reshape(-1, len(groups)), strength.reshape(-1, 1))
+
+    frame = pd.DataFrame(pooled, index=pd.Index(groups, name="group"))
+    frame.insert(0, "label", [MINERAL_GROUPS[group][0] if group in MINERAL_GROUPS else group
+                              for group in groups])
+    frame["r2"] = frame["pearson"] ** 2
+
+    per_mix = pd.DataFrame(_per_mix(eff, strength)[rank_by], index=mixes, columns=frame.index)
+    frame[f"median_mix_{rank_by}"] = per_mix.median()
+    frame["positive_mixes"] = (per_mix > 0).sum() / per_mix.count().clip(lower=1)
+    return _ranked(frame, rank_by)
+
+
+def _per_mix(eff, strength):
+    """``correlate`` over the curing times of every mix, as ``(mix, group)`` arrays."""
+    mixes, times, groups = eff.shape
+    x = eff.transpose(1, 0, 2).reshape(times, mixes * groups)
+    y = np.repeat(strength.T, groups, axis=1)
+    return {name: values.reshape(mixes, groups) for name, values in correlate(x, y).items()}
+
+
+def mix_correlations(joined, groups=None, rank_by="spearman"):
+    """Correlation over the curing times of every mix and group, strongest first."""
+    groups = _groups(joined, groups)
+    mixes, eff, strength = _arrays(joined, groups)
+    per_mix = _per_mix(eff, strength)
+
+    index = pd.MultiIndex.from_product([mixes, groups], names=["mix", "group"])
+    frame = pd.DataFrame({name: values.reshape(-1) for name, values in per_mix.items()}, index=index)
+    return _ranked(frame, rank_by)
+
+
+def update_mix_correlations(previous, joined, changed, groups=None, rank_by="spearman"):
+    """
+    ``mix_correlations`` of ``joined`` recomputing only the mixes in
+    ``changed`` (as returned by ``IncrementalResults.update``) and reusing
+    the rows of ``previous`` for the others. Mixes no longer in ``joined``
+    are dropped. Edits of the strength sheet are not tracked by ``changed``;
+    recompute with ``mix_correlations`` after those.
+    """
+    mixes = joined.index.get_level_values(0)
+    present = previous.index.get_level_values("mix")
+    kept = previous[present.isin(mixes.unique()) & ~present.isin(list(changed))]
+
+    redo = joined[mixes.isin(list(changed))]
+    parts = [kept]
+    if len(redo):
+        parts.append(mix_correlations(redo, groups, rank_by))
+    return _ranked(pd.concat(parts), rank_by)
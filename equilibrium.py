@@ -0,0 +1,253 @@
+"""
+Batch equilibrium engine for ICP results.
+
+The chemical system, the pH specification and the equilibrium solver are
+built once and reused for every row of every sheet, so a whole workbook is
+solved in one pass instead of one script run per sheet.
+
+reaktoro and pandas are only imported when a system is built or a table is
+returned, so modules that only need the constants below (ingestion, the
+service client, manifest checks) start without them.
+"""
+
+import time
+
+import numpy as np
+
+from minerals import EFFECTIVE, GROUPS, MINERAL_GROUPS, MineralIndex
+from results import ResultTable
+
+# =============================================================================
+# Defaults of the original calculation
+# =============================================================================
+
+DATABASE = "CEMDATA18-31-03-2022-phaseVol.dat"
+ELEMENTS = "Al Si Ca K Mg Na S O H"
+
+# ICP column -> aqueous species receiving the measured amount (mol per kg water)
+ICP_SPECIES = {
+    "Al": "Al+3",
+    "Ca": "Ca+2",
+    "K": "K+",
+    "Na": "Na+",
+    "S": "SO4-2",
+    "Si": "SiO2",
+}
+INPUT_COLUMNS = list(ICP_SPECIES) + ["pH"]
+
+TEMPERATURE = 25.0      # celsius
+PRESSURE = 1.0          # atm
+
+# Curing durations of the ICP samples
+CURING_LABELS = ["0 min", "15 min", "30 min", "1 h", "1 d", "7 d"]
+CURING_MINUTES = [0, 15, 30, 60, 1440, 10080]
+
+# Curing durations of the UCS results (rows of the strength sheet)
+STRENGTH_MINUTES = [0, 60, 1440, 10080]
+
+WARM_START = (None, "previous", "nearest")
+
+RESULT_COLUMNS = GROUPS + EFFECTIVE
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def composition_keys(inputs):
+    """Log-scaled ICP amounts and pH used to measure distance between samples."""
+    keys = np.array(inputs, dtype=float, copy=True)
+    keys[:, :-1] = np.log10(np.maximum(keys[:, :-1], 1e-12))
+    return keys
+
+
+def nearest(keys, key):
+    """Index of the row of ``keys`` closest to ``key``."""
+    return int(np.argmin(((keys - key) ** 2).sum(axis=1)))
+
+# =============================================================================
+# Batch engine
+# =============================================================================
+
+
+def build_system(database=DATABASE, elements=ELEMENTS, species=None):
+    """
+    Pitzer aqueous system of all species the database defines for ``elements``,
+    or of the given list of aqueous ``species`` only.
+
+    ``database`` is the path of a PHREEQC database file or an already loaded
+    database.
+    """
+    from reaktoro import ActivityModelPitzer, AqueousPhase, ChemicalSystem, PhreeqcDatabase, speciate
+
+    db = PhreeqcDatabase().load(database) if isinstance(database, str) else database
+
+    # The activity model must be set before the system is created, the
+    # system takes a copy of the phase definition.
+    aqueous = AqueousPhase(speciate(elements) if species is None else " ".join(species))
+    aqueous.set(ActivityModelPitzer())
+    return ChemicalSystem(db, aqueous)
+
+
+class BatchEquilibrium:
+    """
+    Solve many ICP compositions with one system, one set of specs and one solver.
+
+    A prebuilt ``system`` can be passed to skip loading the database. Systems
+    with thermodynamic data frozen at one temperature and pressure pass
+    ``fixed_conditions=(temperature, pressure)`` so other conditions are
+    refused instead of silently giving wrong results. ``groups`` are the
+    reported mineral groups in the ``MINERAL_GROUPS`` layout. An optional
+    ``telemetry.SolveTelemetry`` records every solve.
+    """
+
+    def __init__(self, database=DATABASE, elements=ELEMENTS, system=None, fixed_conditions=None,
+                 telemetry=None, groups=MINERAL_GROUPS):
+        from reaktoro import (AqueousProps, ChemicalState, EquilibriumConditions, EquilibriumSolver,
+                              EquilibriumSpecs)
+
+        # Bound once here, the per-row methods below must not import
+        self.AqueousProps = AqueousProps
+        self.ChemicalState = ChemicalState
+
+        self.database = database
+        self.elements = elements
+        self.fixed_conditions = fixed_conditions
+        self.telemetry = telemetry
+
+        self.system = system if system is not None else build_system(database, elements)
+
+        self.specs = EquilibriumSpecs(self.system)
+        self.specs.temperature()
+        self.specs.pressure()
+        self.specs.pH()
+
+        self.solver = EquilibriumSolver(self.specs)
+        self.conditions = EquilibriumConditions(self.specs)
+        self.minerals = MineralIndex(groups)
+
+    def saturation_indices(self, state):
+        """``{group: si, group_eff: eff}`` of a solved state."""
+        return self.minerals.record(self.AqueousProps(state))
+
+    def initial_state(self, amounts):
+        """Chemical state with 1 kg of water and the ICP amounts of one row."""
+        state = self.ChemicalState(self.system)
+        state.set("H2O", 1, "kg")
+        for species, amount in zip(ICP_SPECIES.values(), amounts):
+            state.set(species, amount, "mol")
+        return state
+
+    def set_conditions(self, pH, temperature=TEMPERATURE, pressure=PRESSURE):
+        if self.fixed_conditions is not None and (temperature, pressure) != self.fixed_conditions:
+            raise ValueError(f"system is only valid at {self.fixed_conditions}, "
+                             f"got {(temperature, pressure)}")
+        self.conditions.temperature(temperature, "celsius")
+        self.conditions.pressure(pressure, "atm")
+        self.conditions.pH(pH)
+        return self.conditions
+
+    def _solve(self, state, row, temperature, pressure, amounts=None, sample=None, record=True):
+        conditions = self.set_conditions(row[-1], temperature, pressure)
+        if self.telemetry is None or not record:
+            if amounts is None:
+                return self.solver.solve(state, conditions)
+            return self.solver.solve(state, conditions, amounts)
+
+        tic = time.perf_counter()
+        if amounts is None:
+            result = self.solver.solve(state, conditions)
+        else:
+            result = self.solver.solve(state, conditions, amounts)
+        self.telemetry.record(sample, row, result, time.perf_counter() - tic, warm=amounts is not None)
+        return result
+
+    def solve_row(self, row, temperature=TEMPERATURE, pressure=PRESSURE, sample=None, record=True):
+        """
+        Solve one row of ``INPUT_COLUMNS`` values and return ``(state, result)``.
+        ``record=False`` keeps the solve out of the telemetry.
+        """
+        state = self.initial_state(row[:-1])
+        result = self._solve(state, row, temperature, pressure, sample=sample, record=record)
+        return state, result
+
+    def solve_warm(self, row, guess, temperature=TEMPERATURE, pressure=PRESSURE, sample=None):
+        """
+        Solve one row starting from the converged state ``guess``.
+
+        The element amounts still come from the row itself, only the initial
+        guess of the species amounts is taken from the neighbouring solution.
+        """
+        amounts = self.initial_state(row[:-1]).componentAmounts()
+        state = self.ChemicalState(guess)
+        result = self._solve(state, row, temperature, pressure, amounts, sample)
+        return state, result
+
+    def solve(self, df, temperature=TEMPERATURE, pressure=PRESSURE,
+              warm_start=None, compare_cold=False):
+        """
+        Solve every row of an ICP table into a preallocated ``ResultTable``.
+
+        With ``warm_start="previous"`` each row starts from the converged
+        state of the row before it (rows are expected in curing-time order),
+        with ``warm_start="nearest"`` from the already solved row closest in
+        composition. ``compare_cold=True`` additionally solves every row from
+        scratch and reports the Newton iterations saved by the warm start.
+        """
+        if warm_start not in WARM_START:
+            raise ValueError(f"warm_start must be one of {WARM_START}, got {warm_start!r}")
+
+        inputs = df[INPUT_COLUMNS].to_numpy(dtype=float)
+        keys = composition_keys(inputs)
+
+        table = ResultTable(len(inputs), self.minerals.groups, index=df.index)
+        phase_si = np.empty((len(inputs), len(self.minerals.phases)))
+        if compare_cold:
+            cold_iterations = table.add_column("cold_iterations", np.int32, -1)
+
+        solved = []
+        for i, (sample, row) in enumerate(zip(df.index, inputs)):
+            if warm_start is None or not solved:
+                state, result = self.solve_row(row, temperature, pressure, sample)
+            else:
+                j = i - 1 if warm_start == "previous" else nearest(keys[:len(solved)], keys[i])
+                state, result = self.solve_warm(row, solved[j], temperature, pressure, sample)
+                if not result.succeeded():
+                    state, result = self.solve_row(row, temperature, pressure, sample)
+            if warm_start is not None:
+                solved.append(state)
+
+            aprops = self.AqueousProps(state)
+            self.minerals.phase_si(aprops, out=phase_si[i])
+            table.set_aqueous(i, aprops)
+            table.set_status(i, result)
+            if compare_cold:
+                cold_iterations[i] = self.solve_row(row, temperature, pressure, record=False)[1].iterations()
+
+        self.minerals.reduce(phase_si, out=(table.si, table.eff))
+        if compare_cold:
+            table.extra["iterations_saved"] = cold_iterations - table.iterations
+        return table
+
+    def solve_frame(self, df, temperature=TEMPERATURE, pressure=PRESSURE, **kwargs):
+        """Solve every row of an ICP table and return one result row per input row."""
+        return self.solve(df, temperature, pressure, **kwargs).to_pandas()
+
+    def solve_stream(self, chunks, **kwargs):
+        """Solve an iterable of ICP chunks, yielding one result DataFrame per chunk."""
+        for chunk in chunks:
+            yield self.solve_frame(chunk, **kwargs)
+
+    def solve_series(self, df, time=None, warm_start="previous", **kwargs):
+        """Solve a curing-time series in time order, warm-starting every sample."""
+        if time is not None:
+            df = df.sort_values(time, kind="stable")
+        return self.solve_frame(df, warm_start=warm_start, **kwargs)
+
+    def solve_sheets(self, path, sheets, **kwargs):
+        """Solve several ICP sheets of a workbook, indexed by ``(sheet, row)``."""
+        import pandas as pd
+
+        with pd.ExcelFile(path) as workbook:
+            frames = {sheet: workbook.parse(sheet) for sheet in sheets}
+        return pd.concat({sheet: self.solve_frame(frames[sheet], **kwargs) for sheet in sheets},
+                         names=["sheet", "row"])
@@ -0,0 +1,96 @@
+"""
+Incremental recomputation of stored results.
+
+Every input row is identified by its sheet and row number and fingerprinted
+by a hash of its rounded Al/Ca/K/Na/S/Si/pH values, the engine
+configuration and the solve options. ``IncrementalResults.update`` only
+solves rows that are new or whose hash changed, merges them into the stored
+result table, drops rows that disappeared from the input and reports which
+mixes changed, so that figures and strength correlations
+(``correlation.update_mix_correlations``) are only redone for those.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from cache import engine_fingerprint
+from equilibrium import INPUT_COLUMNS, PRESSURE, TEMPERATURE
+
+
+def row_hashes(df, fingerprint="", digits=6):
+    """Hash of every row of ``INPUT_COLUMNS``, rounded to ``digits`` significant digits."""
+    values = df[INPUT_COLUMNS].to_numpy(dtype=float)
+    return pd.Series([hashlib.sha1(f"{fingerprint}:{','.join(f'{v:.{digits}g}' for v in row)}".encode())
+                      .hexdigest() for row in values], index=df.index, dtype=object)
+
+
+class IncrementalResults:
+    """Result table stored at ``path`` (Parquet or CSV) indexed by ``(sheet, row)``."""
+
+    def __init__(self, path, digits=6):
+        self.path = path
+        self.digits = digits
+
+    def load(self):
+        """The stored table, or ``None`` before the first update."""
+        if not os.path.exists(self.path):
+            return None
+        if self.path.endswith(".parquet"):
+            return pd.read_parquet(self.path)
+        return pd.read_csv(self.path, index_col=[0, 1])
+
+    def save(self, table):
+        partial = self.path + ".partial"
+        if self.path.endswith(".parquet"):
+            table.to_parquet(partial)
+        else:
+            table.to_csv(partial)
+        os.replace(partial, self.path)
+
+    def update(self, engine, frames, **kwargs):
+        """
+        Bring the stored table up to date with ``frames`` (``{sheet: ICP table}``).
+
+        Returns ``(table, changed)`` where ``changed`` maps every sheet with
+        new, modified or removed rows to the labels of the rows that were
+        solved. Stored sheets missing from ``frames`` are kept unchanged.
+        Keyword arguments go to ``engine.solve_frame`` and are part of the
+        row fingerprint together with the engine configuration, so changing
+        the conditions, system or mineral groups re-solves every row.
+        """
+        options = {"temperature": TEMPERATURE, "pressure": PRESSURE, **kwargs}
+        fingerprint = f"{engine_fingerprint(engine)}:{json.dumps(options, sort_keys=True, default=str)}"
+        stored = self.load()
+        sheets = [] if stored is None else list(stored.index.unique(level=0))
+
+        parts = {sheet: stored.xs(sheet, level=0) for sheet in sheets if sheet not in frames}
+        changed = {}
+        for sheet, df in frames.items():
+            hashes = row_hashes(df, fingerprint, self.digits)
+            previous = stored.xs(sheet, level=0) if sheet in sheets else None
+
+            known = (pd.Series(None, index=hashes.index, dtype=object) if previous is None
+                     else previous["input_hash"].reindex(hashes.index))
+            dirty = hashes.index[known.to_numpy() != hashes.to_numpy()]
+            removed = pd.Index([]) if previous is None else previous.index.difference(hashes.index)
+            if len(dirty) or len(removed):
+                changed[sheet] = dirty
+
+            pieces = []
+            if previous is not None:
+                pieces.append(previous.loc[hashes.index.difference(dirty)])
+            if len(dirty):
+                inputs = df.loc[dirty, INPUT_COLUMNS].assign(input_hash=hashes[dirty])
+                pieces.append(inputs.join(engine.solve_frame(df.loc[dirty], **kwargs), rsuffix="_solved"))
+            if pieces:
+                parts[sheet] = pd.concat(pieces).reindex(hashes.index)
+
+        if parts:
+            table = pd.concat(parts, names=["sheet", "row"])
+        else:
+            table = pd.DataFrame(index=pd.MultiIndex.from_arrays([[], []], names=["sheet", "row"]))
+        self.save(table)
+        return table, changed
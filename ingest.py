@@ -0,0 +1,97 @@
+"""
+Streaming input of ICP results.
+
+Workbooks are opened once for all sheets. Large inputs (Excel, CSV or
+Parquet) are read in chunks of rows that can be passed straight to
+``BatchEquilibrium.solve_stream``, so memory stays bounded by the chunk size.
+"""
+
+import os
+
+import pandas as pd
+
+from equilibrium import INPUT_COLUMNS
+
+WORKBOOK = "result.xlsx"
+ICP_SHEETS = ["stabA", "stabB", "type3", "csa"]
+STRENGTH_SHEET = "strength"
+
+# ICP sheet -> column of the strength sheet with the matching UCS results
+STRENGTH_COLUMNS = {"stabA": "stab_a", "stabB": "stab_b", "type3": "type_3", "csa": "csa"}
+
+CHUNK_SIZE = 10000
+
+
+def read_workbook(path=WORKBOOK, sheets=None):
+    """Read ``sheets`` (all sheets by default) opening the workbook only once."""
+    with pd.ExcelFile(path) as workbook:
+        sheets = workbook.sheet_names if sheets is None else sheets
+        return {sheet: workbook.parse(sheet) for sheet in sheets}
+
+
+def composition_ranges(path=WORKBOOK, sheets=ICP_SHEETS, columns=INPUT_COLUMNS):
+    """``{column: (min, max)}`` of the inputs over all ICP sheets."""
+    data = pd.concat(read_workbook(path, sheets).values())
+    return {column: (float(data[column].min()), float(data[column].max())) for column in columns}
+
+
+def _excel_chunks(path, sheet, chunk_size, columns):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet is not None else workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+        header = list(next(rows))
+        positions = [header.index(column) for column in columns]
+
+        start = 0
+        buffer = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            buffer.append([row[p] for p in positions])
+            if len(buffer) == chunk_size:
+                yield pd.DataFrame(buffer, columns=columns, index=pd.RangeIndex(start, start + len(buffer)))
+                start += len(buffer)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columns, index=pd.RangeIndex(start, start + len(buffer)))
+    finally:
+        workbook.close()
+
+
+def _csv_chunks(path, chunk_size, columns):
+    with pd.read_csv(path, usecols=columns, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            yield chunk[columns]
+
+
+def _parquet_chunks(path, chunk_size, columns):
+    import pyarrow.parquet as pq
+
+    start = 0
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+
+
+def iter_chunks(path, sheet=None, chunk_size=CHUNK_SIZE, columns=INPUT_COLUMNS):
+    """
+    Yield DataFrames of at most ``chunk_size`` rows of ``columns``.
+
+    The format follows the file extension: ``.xlsx``/``.xlsm`` (``sheet``
+    selects the worksheet, the first one by default), ``.csv`` or
+    ``.parquet``. Chunks keep the row numbers of the file as their index.
+    """
+    columns = list(columns)
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".xlsx", ".xlsm"):
+        return _excel_chunks(path, sheet, chunk_size, columns)
+    if extension == ".csv":
+        return _csv_chunks(path, chunk_size, columns)
+    if extension in (".parquet", ".pq"):
+        return _parquet_chunks(path, chunk_size, columns)
+    raise ValueError(f"unsupported input format {extension!r}, expected .xlsx, .csv or .parquet")
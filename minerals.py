@@ -0,0 +1,89 @@
+"""
+Mineral groups whose saturation indices are reported.
+
+Each group is the most saturated of its phases. The effective saturation
+index divides the index of every phase by its normalisation divisor (the
+number of formula units the phase dissolves into) before taking the
+maximum. Adding a mineral is a one-row change to ``MINERAL_GROUPS``.
+"""
+
+import numpy as np
+
+# key: (label, {phase: divisor})
+MINERAL_GROUPS = {
+    "csh": ("C-S-H", {"CSH3T-T2C": 5.5, "CSH3T-T5C": 5, "CSH3T-TobH": 4.5,
+                      "CSHQ-JenD": 5.167, "CSHQ-JenH": 4.999, "CSHQ-TobD": 3.166825,
+                      "CSHQ-TobH": 3.0001}),
+    "ettrin": ("Ettringite", {"ettringite": 15, "ettringite13": 15, "Ettringite13_des": 15,
+                              "ettringite30": 15, "ettringite9": 15, "Ettringite9_des": 15}),
+    "gyp": ("Gypsum", {"Gp": 2}),
+    "port": ("Portlandite", {"Portlandite": 3}),
+    "gib": ("Gibbsite", {"Gbs": 2}),
+    "strat": ("Stratlingite", {"straetlingite": 7, "straetlingite5_5": 7, "straetlingite7": 7}),
+    "mono": ("Monosulfate", {"monosulphate10_5": 11, "monosulphate12": 11, "monosulphate1205": 11,
+                             "monosulphate14": 11, "monosulphate16": 11, "monosulphate9": 11}),
+}
+
+GROUPS = list(MINERAL_GROUPS)
+EFFECTIVE = [f"{group}_eff" for group in GROUPS]
+
+
+class MineralIndex:
+    """
+    Mineral groups resolved to saturation-species indices.
+
+    The indices are looked up by name once, from the first ``AqueousProps``
+    seen; afterwards the saturation indices of all phases are read in one
+    call per sample and reduced to groups with NumPy.
+    """
+
+    def __init__(self, groups=MINERAL_GROUPS):
+        if not groups:
+            raise ValueError("no mineral groups given")
+        empty = [group for group, (_, phases) in groups.items() if not phases]
+        if empty:
+            # reduceat would silently return a neighbouring phase for them
+            raise ValueError(f"mineral groups without phases: {', '.join(empty)}")
+        self.definitions = dict(groups)
+        self.groups = list(groups)
+        self.phases = [phase for _, phases in groups.values() for phase in phases]
+        self.divisors = np.array([d for _, phases in groups.values() for d in phases.values()], dtype=float)
+        self.offsets = np.cumsum([0] + [len(phases) for _, phases in groups.values()])[:-1]
+        self.columns = self.groups + [f"{group}_eff" for group in self.groups]
+        self.indices = None
+
+    def resolve(self, aprops):
+        species = aprops.saturationSpecies()
+        self.indices = np.array([species.index(phase) for phase in self.phases])
+
+    def phase_si(self, aprops, out=None):
+        """Saturation index of every phase of every group, in table order."""
+        if self.indices is None:
+            self.resolve(aprops)
+        si = aprops.saturationIndices().asarray()
+        if out is None:
+            return si[self.indices]
+        return np.take(si, self.indices, out=out)
+
+    def reduce(self, phase_si, out=(None, None)):
+        """
+        Group a ``(samples, phases)`` matrix of phase indices into
+        ``(samples, groups)`` matrices of saturation and effective saturation
+        indices, optionally written into the preallocated pair ``out``.
+        """
+        phase_si = np.atleast_2d(phase_si)
+        si = np.maximum.reduceat(phase_si, self.offsets, axis=1, out=out[0])
+        eff = np.maximum.reduceat(phase_si / self.divisors, self.offsets, axis=1, out=out[1])
+        return si, eff
+
+    def evaluate(self, aprops_list):
+        """Saturation and effective saturation indices of all groups and samples."""
+        phase_si = np.empty((len(aprops_list), len(self.phases)))
+        for i, aprops in enumerate(aprops_list):
+            self.phase_si(aprops, out=phase_si[i])
+        return self.reduce(phase_si)
+
+    def record(self, aprops):
+        """``{group: si, group_eff: eff}`` of one sample."""
+        si, eff = self.reduce(self.phase_si(aprops))
+        return dict(zip(self.columns, np.concatenate([si[0], eff[0]]).tolist()))
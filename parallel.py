@@ -0,0 +1,106 @@
+"""
+Process-pool execution of equilibrium solves.
+
+Reaktoro objects cannot be shared between processes, so every worker loads
+the database and builds its own ``BatchEquilibrium`` once, then solves the
+chunks of (composition, pH, T, P) rows it is given. Results come back in the
+order of the input rows and a failing row is reported in the ``error``
+column instead of aborting the whole batch.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from equilibrium import (DATABASE, ELEMENTS, INPUT_COLUMNS, PRESSURE,
+                         TEMPERATURE, BatchEquilibrium)
+from minerals import MINERAL_GROUPS
+from results import ResultTable
+
+# Engine of the current worker process, built once by the pool initializer
+_engine = None
+
+
+def _init_worker(database, elements, groups):
+    global _engine
+    _engine = BatchEquilibrium(database, elements, groups=groups)
+
+
+def make_pool(workers=None, database=DATABASE, elements=ELEMENTS, groups=MINERAL_GROUPS):
+    """Process pool whose workers each hold one engine; reusable across calls."""
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                               initargs=(database, elements, groups))
+
+
+def _solve_chunk(rows):
+    """Solve rows of ``INPUT_COLUMNS`` + temperature + pressure in a worker."""
+    from reaktoro import AqueousProps
+
+    minerals = _engine.minerals
+    table = ResultTable(len(rows), minerals.groups)
+    errors = table.add_column("error", object, None)
+    phase_si = np.full((len(rows), len(minerals.phases)), np.nan)
+
+    for i, row in enumerate(rows):
+        try:
+            state, result = _engine.solve_row(row[:-2], row[-2], row[-1])
+            aprops = AqueousProps(state)
+            minerals.phase_si(aprops, out=phase_si[i])
+            table.set_aqueous(i, aprops)
+            table.set_status(i, result)
+        except Exception as error:
+            phase_si[i] = np.nan
+            errors[i] = f"{type(error).__name__}: {error}"
+
+    minerals.reduce(phase_si, out=(table.si, table.eff))
+    return table
+
+
+def chunk_rows(df, chunk_size, temperature=TEMPERATURE, pressure=PRESSURE):
+    """
+    Split an ICP table into arrays of ``INPUT_COLUMNS`` + temperature + pressure.
+
+    Optional ``temperature`` (celsius) and ``pressure`` (atm) columns of ``df``
+    override the defaults row by row.
+    """
+    rows = np.empty((len(df), len(INPUT_COLUMNS) + 2))
+    rows[:, :len(INPUT_COLUMNS)] = df[INPUT_COLUMNS].to_numpy(dtype=float)
+    rows[:, -2] = df["temperature"].to_numpy(dtype=float) if "temperature" in df else temperature
+    rows[:, -1] = df["pressure"].to_numpy(dtype=float) if "pressure" in df else pressure
+    return [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+
+
+def solve_parallel(df, workers=None, chunk_size=256, database=DATABASE, elements=ELEMENTS,
+                   temperature=TEMPERATURE, pressure=PRESSURE, groups=MINERAL_GROUPS, pool=None):
+    """
+    Solve every row of ``df`` on a pool of ``workers`` processes.
+
+    A pool from ``make_pool`` can be passed to reuse its workers, in which
+    case ``workers``, ``database``, ``elements`` and ``groups`` are those of
+    the pool.
+    """
+    chunks = chunk_rows(df, chunk_size, temperature, pressure)
+
+    table = ResultTable(len(df), groups, index=df.index)
+    errors = table.add_column("error", object, None)
+    owned = pool is None
+    if owned:
+        pool = make_pool(workers, database, elements, groups)
+    try:
+        start = 0
+        for chunk in pool.map(_solve_chunk, chunks):
+            stop = start + chunk.n
+            table.si[start:stop] = chunk.si
+            table.eff[start:stop] = chunk.eff
+            table.pH[start:stop] = chunk.pH
+            table.ionic_strength[start:stop] = chunk.ionic_strength
+            table.succeeded[start:stop] = chunk.succeeded
+            table.iterations[start:stop] = chunk.iterations
+            errors[start:stop] = chunk.extra["error"]
+            start = stop
+    finally:
+        if owned:
+            pool.shutdown()
+
+    return table.to_pandas()
@@ -0,0 +1,200 @@
+"""
+Figure of the effective saturation indices, relative UCS and pH of a mix.
+
+``FigureTemplate`` builds the three-axis figure once; ``update`` then only
+replaces the line data, so many mixes can be drawn with one figure. Headless
+templates are plain Agg figures that never touch pyplot, and
+``render_batch`` renders the figures of many mixes on a process pool with
+one template per worker and label set, so mixes may have different
+numbers of samples.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import numpy as np
+
+from equilibrium import CURING_LABELS, CURING_MINUTES, STRENGTH_MINUTES
+from minerals import MINERAL_GROUPS
+
+STYLE = {
+    "font.family": "sans-serif",
+    "font.sans-serif": ["Arial", "DejaVu Sans"],
+    "font.size": 10,
+    "font.style": "italic",
+    "font.weight": "bold",
+    "lines.linewidth": 0.75,
+}
+
+# Mineral group -> line format and keyword arguments, in legend order
+LINES = {
+    "csh": ("ko--", dict(markersize=3, fillstyle="none", markeredgewidth=0.5, mfc="k")),
+    "ettrin": ("kd--", dict(markersize=3, fillstyle="none", markeredgewidth=0.5, mfc="k")),
+    "strat": ("kx--", dict(markersize=3)),
+    "gyp": ("o--", dict(color="0.5", markersize=3)),
+    "gib": ("v--", dict(color="0.5", markersize=3)),
+    "port": ("^--", dict(color="0.5", markersize=3)),
+    "mono": ("x-", dict(color="0.5", markersize=3)),
+}
+
+# Positions of the UCS results on the curing-duration axis (0 min, 1 h, 1 d, 7 d)
+STRENGTH_POSITIONS = [CURING_MINUTES.index(minutes) + 1 for minutes in STRENGTH_MINUTES]
+
+# Observed phase: (mineral group, sample position)
+OBSERVED = ("ettrin", 4)
+
+
+def apply_style():
+    """Apply ``STYLE`` to the global pyplot settings (interactive use)."""
+    matplotlib.rcParams.update(STYLE)
+
+
+class FigureTemplate:
+    """Reusable figure with one line per mineral group, strength and pH."""
+
+    def __init__(self, labels=CURING_LABELS, strength_positions=STRENGTH_POSITIONS,
+                 observed=OBSERVED, headless=True):
+        self.headless = headless
+        self.observed = observed
+        with matplotlib.rc_context(STYLE):
+            if headless:
+                from matplotlib.backends.backend_agg import FigureCanvasAgg
+                from matplotlib.figure import Figure
+
+                self.fig = Figure(figsize=[4.7, 3])
+                FigureCanvasAgg(self.fig)
+            else:
+                import matplotlib.pyplot as plt
+
+                self.fig = plt.figure(figsize=[4.7, 3])
+            self._build(labels, strength_positions)
+
+    def _build(self, labels, strength_positions):
+        x = np.arange(1, len(labels) + 1)
+        nan = np.full(len(x), np.nan)
+
+        ax1 = self.fig.add_subplot()
+        ax2 = ax1.twinx()
+        ax2.spines["right"].set_color("red")
+        ax2.tick_params(axis="y", colors="red")
+        ax3 = ax1.twinx()
+        ax3.spines["right"].set_position(("axes", 1.22))
+        ax3.spines["right"].set_color("blue")
+        ax3.tick_params(axis="y", colors="blue")
+        self.axes = (ax1, ax2, ax3)
+
+        self.lines = {}
+        for group, (fmt, kwargs) in LINES.items():
+            self.lines[group], = ax1.plot(x, nan, fmt, label=MINERAL_GROUPS[group][0], **kwargs)
+
+        ax1.set_xlabel("Curing duration", weight="bold")
+        ax1.set_xlim([0.5, len(x) + 0.5])
+        ax1.set_xticks(x, labels=labels)
+        ax1.set_ylim([-6, 2])
+        ax1.set_ylabel("Effective saturation index", weight="bold")
+        ax1.grid(lw=0.1, alpha=.7)
+
+        positions = np.asarray(strength_positions)
+        self.strength, = ax2.plot(positions, np.full(len(positions), np.nan), "r--.",
+                                  label="Strength", markeredgewidth=0.5, fillstyle="none")
+        ax2.set_ylim([0, 300])
+        ax2.set_ylabel("Relative UCS (%)", weight="bold", color="r")
+
+        self.pH, = ax3.plot(x, nan, "b--.", fillstyle="none", markeredgewidth=0.5, label="pH")
+        ax3.set_ylabel("pH", weight="bold", color="b")
+        ax3.set_ylim([4, 12])
+
+        self.marker, = ax1.plot([np.nan], [np.nan], "rd", markersize=3, label="Observed")
+
+        handles = list(self.lines.values()) + [self.strength, self.pH, self.marker]
+        ax1.legend(handles, [h.get_label() for h in handles], ncol=2, fontsize=8,
+                   loc="lower right", frameon=False, borderpad=0.1)
+        self.fig.tight_layout()
+
+    def update(self, eff, pH, strength=None):
+        """
+        Replace the line data in place.
+
+        ``eff`` maps mineral groups (or ``<group>_eff`` columns of a result
+        table) to effective saturation indices per sample, ``strength`` is
+        the relative UCS (1 = 100 %) at ``STRENGTH_POSITIONS``.
+        """
+        n = len(self.pH.get_xdata())
+        columns = {}
+        for group in self.lines:
+            columns[group] = np.asarray(eff[f"{group}_eff"] if f"{group}_eff" in eff else eff[group],
+                                        dtype=float)
+        columns["pH"] = np.asarray(pH, dtype=float)
+        for name, values in columns.items():
+            if len(values) != n:
+                raise ValueError(f"{name} has {len(values)} samples but the template has {n} "
+                                 f"curing times; pass labels of the same length")
+
+        for group, line in self.lines.items():
+            line.set_ydata(columns[group])
+        self.pH.set_ydata(columns["pH"])
+
+        values = np.full(len(self.strength.get_xdata()), np.nan)
+        if strength is not None:
+            strength = np.asarray(strength, dtype=float)[:len(values)]
+            values[:len(strength)] = strength * 100
+        self.strength.set_ydata(values)
+
+        if self.observed is not None:
+            group, position = self.observed
+            # Mixes with fewer samples than the observed position show no marker
+            y = columns[group][position - 1] if position <= n else np.nan
+            self.marker.set_data([position], [y])
+        return self
+
+    def save(self, path):
+        with matplotlib.rc_context(STYLE):
+            self.fig.savefig(path)
+        return path
+
+
+# Templates of the current render worker by (labels, strength positions),
+# each built on first use
+_templates = {}
+
+
+def _init_worker():
+    _templates.clear()
+
+
+def _render(job):
+    name, eff, pH, strength, labels, strength_positions, path = job
+    key = (labels, strength_positions)
+    if key not in _templates:
+        _templates[key] = FigureTemplate(labels, strength_positions, headless=True)
+    return _templates[key].update(eff, pH, strength).save(path)
+
+
+def render_batch(mixes, directory, workers=1, extension="svg"):
+    """
+    Render one figure per mix into ``directory`` and return the file paths.
+
+    ``mixes`` maps a mix name to ``(eff, pH, strength)`` as accepted by
+    ``FigureTemplate.update``, optionally followed by the curing-time
+    ``labels`` and ``strength_positions`` of that mix (``CURING_LABELS`` and
+    ``STRENGTH_POSITIONS`` by default); ``eff`` is converted to plain arrays
+    so it can be sent to the workers.
+    """
+    os.makedirs(directory, exist_ok=True)
+    jobs = []
+    for name, (eff, pH, strength, *layout) in mixes.items():
+        labels = tuple(layout[0]) if len(layout) > 0 else tuple(CURING_LABELS)
+        strength_positions = tuple(layout[1]) if len(layout) > 1 else tuple(STRENGTH_POSITIONS)
+        eff = {group: np.asarray(eff[f"{group}_eff"] if f"{group}_eff" in eff else eff[group], dtype=float)
+               for group in LINES}
+        jobs.append((name, eff, np.asarray(pH, dtype=float),
+                     None if strength is None else np.asarray(strength, dtype=float),
+                     labels, strength_positions, os.path.join(directory, f"{name}.{extension}")))
+
+    if workers == 1:
+        _init_worker()
+        return [_render(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(_render, jobs))
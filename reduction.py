@@ -0,0 +1,79 @@
+"""
+Reduced chemical systems.
+
+``speciate`` pulls in every aqueous species CEMDATA18 defines for the
+elements, although many of them never reach significant amounts in our pore
+solutions (Mg is never given an amount at all). ``reduce_engine`` solves a
+training set of compositions with the full system, keeps the aqueous species
+whose mole fraction exceeds ``threshold`` in at least one of them, builds an
+engine on that smaller system (smaller Jacobians, cheaper Pitzer
+evaluations) and checks its saturation indices against the full system.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from equilibrium import ICP_SPECIES, INPUT_COLUMNS, BatchEquilibrium, build_system
+
+# Species needed to set the initial state and the pH constraint
+REQUIRED = ["H2O", "H+", "OH-"] + list(ICP_SPECIES.values())
+
+THRESHOLD = 1e-10
+
+
+def species_fractions(engine, df):
+    """Largest aqueous mole fraction of every species over the rows of ``df``."""
+    names = [species.name() for species in engine.system.species()]
+    largest = np.zeros(len(names))
+    for row in df[INPUT_COLUMNS].to_numpy(dtype=float):
+        state, result = engine.solve_row(row)
+        if not result.succeeded():
+            continue
+        amounts = state.speciesAmounts().asarray()
+        np.maximum(largest, amounts / amounts.sum(), out=largest)
+    return pd.Series(largest, index=names)
+
+
+def significant_species(engine, df, threshold=THRESHOLD):
+    """Names of the species above ``threshold`` in the training rows, plus ``REQUIRED``."""
+    fractions = species_fractions(engine, df)
+    return [name for name in fractions.index if fractions[name] >= threshold or name in REQUIRED]
+
+
+def compare(full, reduced, df):
+    """Accuracy and speed of ``reduced`` against ``full`` on the rows of ``df``."""
+    tic = time.perf_counter()
+    expected = full.solve_frame(df)
+    full_seconds = time.perf_counter() - tic
+
+    tic = time.perf_counter()
+    actual = reduced.solve_frame(df)
+    reduced_seconds = time.perf_counter() - tic
+
+    columns = full.minerals.columns
+    ok = expected["succeeded"].to_numpy() & actual["succeeded"].to_numpy()
+    error = (actual.loc[ok, columns] - expected.loc[ok, columns]).abs()
+    return {
+        "species_full": len(full.system.species()),
+        "species_reduced": len(reduced.system.species()),
+        "max_abs_error": error.max().to_dict(),
+        "failed_full": int((~expected["succeeded"]).sum()),
+        "failed_reduced": int((~actual["succeeded"]).sum()),
+        "speedup": full_seconds / reduced_seconds if reduced_seconds else np.nan,
+    }
+
+
+def reduce_engine(engine, training, threshold=THRESHOLD, validation=None):
+    """
+    Engine on the species significant in ``training`` and the comparison
+    with the full ``engine`` on ``validation`` (the training rows by default).
+    """
+    species = significant_species(engine, training, threshold)
+    system = build_system(engine.database, engine.elements, species)
+    reduced = BatchEquilibrium(engine.database, engine.elements, system=system,
+                               telemetry=engine.telemetry, groups=engine.minerals.definitions)
+    report = compare(engine, reduced, training if validation is None else validation)
+    report["species"] = species
+    return reduced, report
@@ -0,0 +1,71 @@
+"""
+Preallocated columnar result buffers.
+
+A ``ResultTable`` is sized from the number of input rows before solving and
+filled in place, so collecting results costs one allocation per column
+instead of one reallocation per sample. The columns are exported to pandas
+and Arrow without copying the float and integer buffers.
+"""
+
+import numpy as np
+
+from minerals import GROUPS
+
+
+class ResultTable:
+    """Typed result columns for ``n`` samples."""
+
+    def __init__(self, n, groups=GROUPS, index=None):
+        self.n = n
+        self.groups = list(groups)
+        self.index = index
+
+        # Column-major, so every group column is a contiguous view
+        self.si = np.full((n, len(self.groups)), np.nan, order="F")
+        self.eff = np.full((n, len(self.groups)), np.nan, order="F")
+        self.pH = np.full(n, np.nan)
+        self.ionic_strength = np.full(n, np.nan)
+        self.succeeded = np.zeros(n, dtype=bool)
+        self.iterations = np.full(n, -1, dtype=np.int32)
+        self.extra = {}
+
+    def add_column(self, name, dtype=float, fill=np.nan):
+        """Allocate an additional column and return it for filling."""
+        self.extra[name] = np.full(self.n, fill, dtype=dtype)
+        return self.extra[name]
+
+    def set_aqueous(self, i, aprops):
+        """Store the aqueous properties of sample ``i``."""
+        self.pH[i] = float(aprops.pH())
+        self.ionic_strength[i] = float(aprops.ionicStrength())
+
+    def set_status(self, i, result):
+        """Store the solver status of sample ``i``."""
+        self.succeeded[i] = result.succeeded()
+        self.iterations[i] = result.iterations()
+
+    def columns(self):
+        """``{name: 1-D array}`` views of every column."""
+        columns = {}
+        for j, group in enumerate(self.groups):
+            columns[group] = self.si[:, j]
+        for j, group in enumerate(self.groups):
+            columns[f"{group}_eff"] = self.eff[:, j]
+        columns["pH"] = self.pH
+        columns["ionic_strength"] = self.ionic_strength
+        columns["succeeded"] = self.succeeded
+        columns["iterations"] = self.iterations
+        columns.update(self.extra)
+        return columns
+
+    def to_pandas(self):
+        """DataFrame sharing the column buffers."""
+        import pandas as pd
+
+        return pd.DataFrame(self.columns(), index=self.index, copy=False)
+
+    def to_arrow(self):
+        """Arrow table; numeric columns wrap the buffers without copying."""
+        import pyarrow as pa
+
+        return pa.table({name: pa.array(column) for name, column in self.columns().items()})
@@ -0,0 +1,321 @@
+"""
+Long-lived equilibrium service.
+
+The service keeps a pool of workers that have loaded the database and built
+their ``BatchEquilibrium`` once (see ``parallel.make_pool``) and answers
+composition queries over HTTP on a TCP port or a Unix socket, so a query
+costs one solve instead of a Python start-up, the reaktoro import and a
+database parse. Requests arriving within ``max_wait`` seconds of each other
+are merged into one batch of at most ``max_batch`` rows; at most one batch
+per worker is in flight, so batches grow while the workers are busy::
+
+    python service.py --socket /tmp/equilibrium.sock --workers 4
+    python client.py --socket /tmp/equilibrium.sock rows.json
+
+Endpoints:
+
+``POST /solve``
+    JSON list of rows (or ``{"rows": [...]}``) with the ``INPUT_COLUMNS``
+    and optional ``temperature`` / ``pressure``; answers ``{"results": [...]}``
+    with the saturation indices, effective SIs, pH and solver status per row.
+``GET /metrics``
+    Request, row and batch counts, queue depth and latency percentiles.
+``GET /health``
+    ``{"status": "ok"}``.
+
+Requests that are still queued when the service stops are answered with
+503 instead of being left waiting.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import stat
+import sys
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from client import HOST, PORT
+from equilibrium import DATABASE, ELEMENTS, PRESSURE, TEMPERATURE
+from minerals import MINERAL_GROUPS
+from parallel import _solve_chunk, chunk_rows, make_pool
+
+MAX_BATCH = 256
+MAX_WAIT = 0.005
+
+# Number of recent requests and batches the latency percentiles are taken over
+WINDOW = 10000
+PERCENTILES = [50, 90, 99]
+
+STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error",
+          503: "Service Unavailable"}
+
+
+class ServiceStopped(RuntimeError):
+    """Raised for requests still queued when the service stops."""
+
+
+def parse_rows(payload, temperature=TEMPERATURE, pressure=PRESSURE):
+    """Array of ``INPUT_COLUMNS`` + temperature + pressure of a ``/solve`` body."""
+    records = payload["rows"] if isinstance(payload, dict) and "rows" in payload else payload
+    if isinstance(records, dict):
+        records = [records]
+    if not isinstance(records, list) or not records:
+        raise ValueError("expected a non-empty list of rows")
+    return chunk_rows(pd.DataFrame.from_records(records), len(records), temperature, pressure)[0]
+
+
+def _records(columns, start, stop):
+    names = list(columns)
+    values = [[None if isinstance(v, float) and v != v else v for v in columns[name][start:stop].tolist()]
+              for name in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def _percentiles(values):
+    if not values:
+        return {f"p{q}": None for q in PERCENTILES}
+    return dict(zip((f"p{q}" for q in PERCENTILES), np.percentile(values, PERCENTILES).tolist()))
+
+
+class EquilibriumService:
+    """
+    Micro-batching front end of a worker pool.
+
+    ``solve`` is run on ``pool`` with an array of rows (``INPUT_COLUMNS`` +
+    temperature + pressure) and returns a table with a ``columns()`` method
+    such as ``ResultTable``; a stub solver and a thread pool serve the
+    batching logic without reaktoro.
+    """
+
+    def __init__(self, workers=1, database=DATABASE, elements=ELEMENTS, groups=MINERAL_GROUPS,
+                 max_batch=MAX_BATCH, max_wait=MAX_WAIT, temperature=TEMPERATURE,
+                 pressure=PRESSURE, pool=None, solve=_solve_chunk):
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.temperature = temperature
+        self.pressure = pressure
+        self.owned = pool is None
+        self.pool = make_pool(workers, database, elements, groups) if pool is None else pool
+        self.solve = solve
+
+        self.queue = None
+        self.slots = None
+        self.batcher = None
+        self.waiting = []
+        self.stopping = False
+        self.tasks = set()
+
+        self.started = time.time()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.errors = 0
+        self.queued_rows = 0
+        self.in_flight = 0
+        self.latencies = deque(maxlen=WINDOW)
+        self.batch_seconds = deque(maxlen=WINDOW)
+        self.batch_rows = deque(maxlen=WINDOW)
+
+    async def start(self):
+        # Start the workers (and load the database) before any connection is
+        # accepted, forked workers would otherwise inherit the client sockets.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, os.getpid) for _ in range(self.workers)))
+        self.queue = asyncio.Queue()
+        self.slots = asyncio.Semaphore(self.workers)
+        self.batcher = asyncio.create_task(self._batch_loop())
+
+    async def stop(self):
+        # Requests not yet dispatched are answered with 503 instead of hanging
+        self.stopping = True
+        if self.batcher is not None:
+            self.batcher.cancel()
+            try:
+                await self.batcher
+            except asyncio.CancelledError:
+                pass
+        pending = self.waiting
+        while self.queue is not None and not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(ServiceStopped("service is stopping"))
+        self.waiting = []
+        self.queued_rows = 0
+        for task in list(self.tasks):
+            await task
+        if self.owned:
+            self.pool.shutdown()
+
+    async def submit(self, rows):
+        """Queue an array of rows and wait for its ``{column: values}`` results."""
+        if self.stopping:
+            raise ServiceStopped("service is stopping")
+        future = asyncio.get_running_loop().create_future()
+        self.queued_rows += len(rows)
+        await self.queue.put((rows, future))
+        return await future
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self.waiting = [await self.queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout > 0:
+                        item = await asyncio.wait_for(self.queue.get(), timeout)
+                    else:
+                        item = self.queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            # Only dispatch when a worker is free; requests keep queueing meanwhile
+            await self.slots.acquire()
+            self.waiting = []
+            self.queued_rows -= size
+            task = asyncio.create_task(self._dispatch(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _dispatch(self, batch):
+        loop = asyncio.get_running_loop()
+        rows = np.concatenate([item[0] for item in batch])
+        self.in_flight += 1
+        tic = time.perf_counter()
+        try:
+            table = await loop.run_in_executor(self.pool, self.solve, rows)
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        finally:
+            self.in_flight -= 1
+            self.slots.release()
+
+        self.batches += 1
+        self.batch_seconds.append(time.perf_counter() - tic)
+        self.batch_rows.append(len(rows))
+        columns = table.columns()
+        start = 0
+        for item, future in batch:
+            stop = start + len(item)
+            if not future.done():
+                future.set_result(_records(columns, start, stop))
+            start = stop
+
+    def metrics(self):
+        """Counters, queue depth and latency percentiles (seconds)."""
+        return {
+            "uptime": time.time() - self.started,
+            "requests": self.requests,
+            "rows": self.rows,
+            "batches": self.batches,
+            "errors": self.errors,
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "queued_rows": self.queued_rows,
+            "in_flight": self.in_flight,
+            "mean_batch_rows": float(np.mean(self.batch_rows)) if self.batch_rows else None,
+            "latency": _percentiles(self.latencies),
+            "batch_seconds": _percentiles(self.batch_seconds),
+        }
+
+    async def _route(self, method, path, body):
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        if method == "GET" and path == "/metrics":
+            return 200, self.metrics()
+        if method == "POST" and path == "/solve":
+            rows = parse_rows(json.loads(body or b"null"), self.temperature, self.pressure)
+            tic = time.perf_counter()
+            results = await self.submit(rows)
+            self.latencies.append(time.perf_counter() - tic)
+            self.requests += 1
+            self.rows += len(rows)
+            return 200, {"results": results}
+        return 404, {"error": f"no route {method} {path}"}
+
+    async def handle(self, reader, writer):
+        """Answer one HTTP/1.1 request per connection."""
+        try:
+            method, path, _ = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            status, payload = await self._route(method, path, body)
+        except ServiceStopped as error:
+            status, payload = 503, {"error": str(error)}
+        except (ValueError, KeyError, TypeError) as error:
+            self.errors += 1
+            status, payload = 400, {"error": f"{type(error).__name__}: {error}"}
+        except Exception as error:
+            self.errors += 1
+            status, payload = 500, {"error": f"{type(error).__name__}: {error}"}
+
+        data = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status} {STATUS[status]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host=HOST, port=PORT, path=None):
+        """Serve on ``path`` (Unix socket) or ``host:port`` until cancelled."""
+        await self.start()
+        if path is not None:
+            # Remove the socket left behind by a previous run
+            if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+                os.remove(path)
+            server = await asyncio.start_unix_server(self.handle, path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve equilibrium queries over HTTP.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--socket", help="listen on this Unix socket instead of host:port")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--database", default=DATABASE)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait", type=float, default=MAX_WAIT, help="batching window in seconds")
+    args = parser.parse_args(argv)
+
+    service = EquilibriumService(args.workers, args.database, max_batch=args.max_batch,
+                                 max_wait=args.max_wait)
+
+    async def serve():
+        # Shut the pool down cleanly when the scheduler stops the service
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        await service.serve(args.host, args.port, args.socket)
+
+    try:
+        asyncio.run(serve())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Precomputed saturation-index lookup surface.
+
+The equilibrium is solved once on a regular grid over Al, Ca, Si, S (log10
+of the amounts) and pH spanning the ICP sheets, with K and Na held at their
+median. The raw and effective saturation index of every mineral group is
+stored in a compact ``.npz`` file, and later queries are answered by
+multilinear interpolation (or any ``scipy.interpolate.RegularGridInterpolator``
+method when SciPy is installed). The interpolation error measured on random
+validation solves is stored with the surface as its error bound. Queries
+outside the grid, hitting failed grid solves, or whose K or Na differ from
+the fixed values by more than ``FIXED_RTOL`` fall back to a true solve when
+an engine is given.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from equilibrium import INPUT_COLUMNS, RESULT_COLUMNS
+from ingest import ICP_SHEETS, WORKBOOK, composition_ranges, read_workbook
+
+AXES = ["Al", "Ca", "Si", "S", "pH"]
+FIXED = ["K", "Na"]
+
+# Amounts are interpolated in log10, pH linearly
+LOG_AXES = {"Al", "Ca", "Si", "S"}
+
+# Relative deviation of K/Na from the fixed values still answered by the surface
+FIXED_RTOL = 0.1
+
+
+def _coordinates(df):
+    coordinates = df[AXES].to_numpy(dtype=float, copy=True)
+    for j, axis in enumerate(AXES):
+        if axis in LOG_AXES:
+            coordinates[:, j] = np.log10(np.maximum(coordinates[:, j], 1e-300))
+    return coordinates
+
+
+def _rows(coordinates, fixed):
+    """ICP table of ``INPUT_COLUMNS`` for points given in surface coordinates."""
+    df = pd.DataFrame(coordinates, columns=AXES)
+    for axis in LOG_AXES:
+        df[axis] = 10 ** df[axis]
+    for column, value in fixed.items():
+        df[column] = value
+    return df[INPUT_COLUMNS]
+
+
+def _default_solve(engine):
+    return lambda df: engine.solve_frame(df, warm_start="previous")
+
+
+class SISurface:
+    """Gridded saturation indices with interpolation and an error bound."""
+
+    def __init__(self, grid, values, fixed, error=None, columns=RESULT_COLUMNS):
+        self.grid = [np.asarray(axis, dtype=float) for axis in grid]
+        self.values = values
+        self.fixed = dict(fixed)
+        self.columns = list(columns)
+        self.error = error if error is not None else np.full(len(self.columns), np.nan)
+        self._interpolators = {}
+
+    def save(self, path):
+        np.savez_compressed(path, values=self.values, error=self.error,
+                            columns=np.array(self.columns),
+                            fixed_names=np.array(list(self.fixed)),
+                            fixed_values=np.array(list(self.fixed.values())),
+                            **{f"grid_{axis}": g for axis, g in zip(AXES, self.grid)})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            grid = [data[f"grid_{axis}"] for axis in AXES]
+            fixed = dict(zip(data["fixed_names"].tolist(), data["fixed_values"].tolist()))
+            return cls(grid, data["values"], fixed, data["error"], data["columns"].tolist())
+
+    def inside(self, coordinates):
+        """Mask of the points within the grid bounds."""
+        low = np.array([axis[0] for axis in self.grid])
+        high = np.array([axis[-1] for axis in self.grid])
+        return np.all((coordinates >= low) & (coordinates <= high), axis=1)
+
+    def _linear(self, coordinates):
+        cells = []
+        weights = []
+        for j, axis in enumerate(self.grid):
+            k = np.clip(np.searchsorted(axis, coordinates[:, j], side="right") - 1, 0, len(axis) - 2)
+            cells.append(k)
+            weights.append((coordinates[:, j] - axis[k]) / (axis[k + 1] - axis[k]))
+
+        out = np.zeros((len(coordinates), self.values.shape[-1]))
+        for corner in itertools.product((0, 1), repeat=len(self.grid)):
+            w = np.ones(len(coordinates))
+            for j, c in enumerate(corner):
+                w *= weights[j] if c else 1 - weights[j]
+            index = tuple(cells[j] + c for j, c in enumerate(corner))
+            out += w[:, None] * self.values[index]
+        return out
+
+    def interpolate(self, coordinates, method="linear"):
+        """Interpolated values at points in surface coordinates (no bounds check)."""
+        if method == "linear":
+            return self._linear(coordinates)
+
+        from scipy.interpolate import RegularGridInterpolator
+
+        if method not in self._interpolators:
+            self._interpolators[method] = RegularGridInterpolator(self.grid, self.values, method=method)
+        return self._interpolators[method](coordinates)
+
+    def mismatch(self, df, rtol=FIXED_RTOL):
+        """Mask of the rows whose K/Na columns differ from the fixed values by more than ``rtol``."""
+        mask = np.zeros(len(df), dtype=bool)
+        for column, value in self.fixed.items():
+            if column in df:
+                mask |= np.abs(df[column].to_numpy(dtype=float) - value) > rtol * abs(value)
+        return mask
+
+    def query(self, df, engine=None, method="linear", rtol=FIXED_RTOL):
+        """
+        Saturation indices of the rows of ``df`` (columns ``AXES``, optionally
+        ``FIXED``).
+
+        The ``source`` column tells whether a row was interpolated
+        (``surface``), solved (``solve``) or could not be answered without an
+        engine: ``outside`` rows are NaN, ``fixed`` rows are interpolated at
+        the surface's K/Na although theirs differ by more than ``rtol``, so
+        ``error_bound`` does not apply to them.
+        """
+        coordinates = _coordinates(df)
+        inside = self.inside(coordinates)
+
+        values = np.full((len(df), len(self.columns)), np.nan)
+        if inside.any():
+            values[inside] = self.interpolate(coordinates[inside], method)
+
+        outside = ~inside | np.isnan(values).any(axis=1)
+        mismatch = self.mismatch(df, rtol) & ~outside
+        fallback = outside | mismatch
+        source = np.where(outside, "outside", np.where(mismatch, "fixed", "surface")).astype(object)
+        if engine is not None and fallback.any():
+            rows = df.loc[fallback].copy()
+            for column, value in self.fixed.items():
+                if column not in rows:
+                    rows[column] = value
+            solved = engine.solve_frame(rows[INPUT_COLUMNS])
+            values[fallback] = solved[self.columns].to_numpy()
+            source[fallback] = "solve"
+
+        result = pd.DataFrame(values, index=df.index, columns=self.columns)
+        result["source"] = source
+        return result
+
+    def error_bound(self):
+        """``{column: max abs interpolation error}`` measured when the surface was built."""
+        return dict(zip(self.columns, self.error.tolist()))
+
+
+def build_surface(engine, points=6, workbook=WORKBOOK, ranges=None, fixed=None,
+                  validation=200, seed=0, solve=None):
+    """
+    Solve the grid of ``points`` per axis and measure the interpolation error
+    on ``validation`` random points.
+
+    ``solve`` maps an ICP table to a result table and defaults to warm-started
+    solves with ``engine``; ``parallel.solve_parallel`` can be used instead.
+    """
+    solve = solve or _default_solve(engine)
+    if ranges is None:
+        ranges = composition_ranges(workbook)
+    if fixed is None:
+        data = pd.concat(read_workbook(workbook, ICP_SHEETS).values())
+        fixed = {column: float(data[column].median()) for column in FIXED if column in data}
+
+    grid = []
+    for axis in AXES:
+        low, high = ranges[axis]
+        if axis in LOG_AXES:
+            low, high = np.log10(low), np.log10(high)
+        grid.append(np.linspace(low, high, points))
+
+    mesh = np.stack(np.meshgrid(*grid, indexing="ij"), axis=-1).reshape(-1, len(AXES))
+    solved = solve(_rows(mesh, fixed))
+    values = solved[RESULT_COLUMNS].to_numpy(dtype=np.float32)
+    values[~solved["succeeded"].to_numpy(dtype=bool)] = np.nan
+    surface = SISurface(grid, values.reshape(*(len(g) for g in grid), len(RESULT_COLUMNS)), fixed)
+
+    if validation:
+        rng = np.random.default_rng(seed)
+        low = np.array([g[0] for g in grid])
+        high = np.array([g[-1] for g in grid])
+        samples = rng.uniform(low, high, (validation, len(AXES)))
+        truth = solve(_rows(samples, fixed))
+        ok = truth["succeeded"].to_numpy(dtype=bool)
+        estimate = surface.interpolate(samples[ok])
+        surface.error = np.nanmax(np.abs(estimate - truth[RESULT_COLUMNS].to_numpy()[ok]), axis=0)
+
+    return surface
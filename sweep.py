@@ -0,0 +1,102 @@
+"""
+Temperature and pressure sweeps.
+
+Every sample is solved at every temperature (and optionally pressure) of
+the sweep. By default the standard thermodynamic properties of all species
+are evaluated once per temperature and pressure (see
+``system_cache.compile_system``) and the resulting system and solver are
+shared by all samples at that temperature, instead of re-evaluating them in
+every solve. With ``frozen=False`` a single solver with the full
+temperature-dependent database is reused for the whole sweep. In both cases
+samples are warm-started from the previous sample at the same temperature.
+"""
+
+import numpy as np
+import pandas as pd
+
+from equilibrium import PRESSURE, BatchEquilibrium, build_system
+from system_cache import compile_system, restore_system
+
+
+class ThermoCache:
+    """
+    Engines with standard properties frozen at one temperature and pressure
+    each, with the mineral groups of ``engine``.
+
+    An engine that is itself frozen (``system_cache.load_engine``) only has
+    the properties at its own conditions, so the full system is rebuilt from
+    its database to compile the other temperatures.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.engines = {}
+        self.system = engine.system if engine.fixed_conditions is None else None
+
+    def get(self, temperature, pressure):
+        key = (float(temperature), float(pressure))
+        if key not in self.engines:
+            if self.system is None:
+                self.system = build_system(self.engine.database, self.engine.elements)
+            system = restore_system(compile_system(self.system, *key))
+            self.engines[key] = BatchEquilibrium(self.engine.database, self.engine.elements,
+                                                 system=system, fixed_conditions=key,
+                                                 telemetry=self.engine.telemetry,
+                                                 groups=self.engine.minerals.definitions)
+        return self.engines[key]
+
+
+class SweepResult:
+    """Saturation indices of shape ``(sample, temperature, pressure, group)``."""
+
+    def __init__(self, index, temperatures, pressures, groups, si, eff, succeeded):
+        self.index = index
+        self.temperatures = np.asarray(temperatures, dtype=float)
+        self.pressures = np.asarray(pressures, dtype=float)
+        self.groups = list(groups)
+        self.si = si
+        self.eff = eff
+        self.succeeded = succeeded
+
+    def at_pressure(self, k=0):
+        """``(si, eff)`` arrays of shape ``(sample, temperature, group)`` at pressure ``k``."""
+        return self.si[:, :, k], self.eff[:, :, k]
+
+    def to_frame(self):
+        """Long table with one row per sample, temperature and pressure."""
+        index = pd.MultiIndex.from_product([self.index, self.temperatures, self.pressures],
+                                           names=[self.index.name or "sample", "temperature", "pressure"])
+        n = len(index)
+        frame = pd.DataFrame(self.si.reshape(n, -1), index=index, columns=self.groups)
+        frame[[f"{group}_eff" for group in self.groups]] = self.eff.reshape(n, -1)
+        frame["succeeded"] = self.succeeded.reshape(n)
+        return frame
+
+
+def sweep(engine, df, temperatures, pressures=(PRESSURE,), frozen=True, cache=None):
+    """
+    Solve every row of ``df`` at every temperature (celsius) and pressure
+    (atm). A ``ThermoCache`` can be passed to share the frozen systems
+    between several sweeps. With ``frozen=False`` the engine itself solves
+    every condition, so it must not be a frozen engine.
+    """
+    if not frozen and engine.fixed_conditions is not None:
+        raise ValueError(f"engine is frozen at {engine.fixed_conditions}, use frozen=True to sweep")
+    if frozen and cache is None:
+        cache = ThermoCache(engine)
+
+    groups = engine.minerals.groups
+    shape = (len(df), len(temperatures), len(pressures), len(groups))
+    si = np.full(shape, np.nan)
+    eff = np.full(shape, np.nan)
+    succeeded = np.zeros(shape[:3], dtype=bool)
+
+    for i, temperature in enumerate(temperatures):
+        for k, pressure in enumerate(pressures):
+            solver = cache.get(temperature, pressure) if frozen else engine
+            table = solver.solve(df, temperature, pressure, warm_start="previous")
+            si[:, i, k] = table.si
+            eff[:, i, k] = table.eff
+            succeeded[:, i, k] = table.succeeded
+
+    return SweepResult(df.index, temperatures, pressures, groups, si, eff, succeeded)
@@ -0,0 +1,153 @@
+"""
+Compiled chemical system cache for fast startup.
+
+Parsing CEMDATA18 and speciating is a large fixed cost for every short job.
+``load_engine`` resolves the system once, stores the species (aqueous
+species of the system and the minerals used for saturation indices) with
+their standard thermodynamic properties evaluated at the fixed temperature
+and pressure in a pickle file, and rebuilds the system from that file on
+later runs without touching the database. The cache is rebuilt whenever the
+database file, the element list or the conditions change.
+
+The rebuilt system uses constant standard properties, so it is only valid at
+the temperature and pressure it was compiled for.
+"""
+
+import os
+import pickle
+import time
+
+from reaktoro import (ActivityModelPitzer, AggregateState, AqueousPhase,
+                      ChemicalSystem, Database, Element, ElementalComposition,
+                      Species, StandardThermoModelConstant,
+                      StandardThermoModelParamsConstant)
+
+from cache import file_digest
+from equilibrium import (DATABASE, ELEMENTS, PRESSURE, TEMPERATURE,
+                         BatchEquilibrium, build_system)
+
+SYSTEM_CACHE = "equilibrium_system.pkl"
+VERSION = 1
+
+THERMO_PROPS = ["G0", "H0", "V0", "VT0", "VP0", "Cp0"]
+
+
+def _species_record(species, T, P):
+    props = species.props(T, P)
+    elements = species.elements()
+    return {
+        "name": species.name(),
+        "formula": str(species.formula()),
+        "charge": float(species.charge()),
+        "state": species.aggregateState().name,
+        "tags": list(species.tags()),
+        "elements": [(symbol, float(coefficient)) for symbol, coefficient
+                     in zip(elements.symbols(), elements.coefficients())],
+        "props": {name: float(getattr(props, name)) for name in THERMO_PROPS},
+    }
+
+
+def compile_system(system, temperature=TEMPERATURE, pressure=PRESSURE):
+    """
+    Resolve ``system`` into plain records at ``temperature`` (celsius) and
+    ``pressure`` (atm).
+
+    Besides the aqueous species, every non-aqueous database species made of
+    the system's elements is kept so saturation indices stay available.
+    """
+    T = temperature + 273.15
+    P = pressure * 101325.0
+    symbols = {element.symbol() for element in system.elements()}
+
+    aqueous = [_species_record(species, T, P) for species in system.species()]
+    minerals = [_species_record(species, T, P) for species in system.database().species()
+                if species.aggregateState() != AggregateState.Aqueous
+                and set(species.elements().symbols()) <= symbols]
+
+    return {"aqueous": aqueous, "minerals": minerals}
+
+
+def _species(record):
+    params = StandardThermoModelParamsConstant()
+    for name, value in record["props"].items():
+        setattr(params, name, value)
+
+    elements = ElementalComposition([(Element(symbol), coefficient)
+                                     for symbol, coefficient in record["elements"]])
+    return (Species()
+            .withName(record["name"])
+            .withFormula(record["formula"])
+            .withElements(elements)
+            .withCharge(record["charge"])
+            .withAggregateState(getattr(AggregateState, record["state"]))
+            .withTags(record["tags"])
+            .withStandardThermoModel(StandardThermoModelConstant(params)))
+
+
+def restore_system(compiled):
+    """Rebuild a Pitzer ``ChemicalSystem`` from ``compile_system`` records."""
+    db = Database()
+    for record in compiled["aqueous"] + compiled["minerals"]:
+        db.addSpecies(_species(record))
+
+    aqueous = AqueousPhase(" ".join(record["name"] for record in compiled["aqueous"]))
+    aqueous.set(ActivityModelPitzer())
+    return ChemicalSystem(db, aqueous)
+
+
+def load_engine(database=DATABASE, elements=ELEMENTS, path=SYSTEM_CACHE,
+                temperature=TEMPERATURE, pressure=PRESSURE):
+    """
+    Return ``(engine, timings)`` where ``timings`` is the startup-time
+    breakdown in seconds; the cache at ``path`` is used when it is valid and
+    written otherwise.
+    """
+    timings = {}
+    start = time.perf_counter()
+
+    key = (VERSION, file_digest(database), elements, temperature, pressure)
+    timings["fingerprint"] = time.perf_counter() - start
+
+    compiled = None
+    if os.path.exists(path):
+        tic = time.perf_counter()
+        try:
+            with open(path, "rb") as f:
+                cached = pickle.load(f)
+            if cached["key"] == key:
+                compiled = cached["system"]
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+                IndexError, KeyError, TypeError, ValueError):
+            # Truncated or foreign file: rebuild and overwrite it
+            compiled = None
+        timings["read_cache"] = time.perf_counter() - tic
+
+    if compiled is None:
+        tic = time.perf_counter()
+        full = build_system(database, elements)
+        timings["parse_database"] = time.perf_counter() - tic
+
+        tic = time.perf_counter()
+        compiled = compile_system(full, temperature, pressure)
+        partial = path + ".partial"
+        with open(partial, "wb") as f:
+            pickle.dump({"key": key, "system": compiled}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, path)
+        timings["write_cache"] = time.perf_counter() - tic
+
+    tic = time.perf_counter()
+    system = restore_system(compiled)
+    timings["build_system"] = time.perf_counter() - tic
+
+    tic = time.perf_counter()
+    engine = BatchEquilibrium(database, elements, system=system,
+                              fixed_conditions=(temperature, pressure))
+    timings["build_solver"] = time.perf_counter() - tic
+
+    timings["total"] = time.perf_counter() - start
+    return engine, timings
+
+
+def format_timings(timings):
+    """Startup-time breakdown as aligned text lines."""
+    return "\n".join(f"{stage:<16}{seconds * 1000:10.1f} ms" for stage, seconds in timings.items())
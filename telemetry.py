@@ -0,0 +1,101 @@
+"""
+Opt-in per-solve telemetry.
+
+Passing a ``SolveTelemetry`` to ``BatchEquilibrium`` records, for every
+solve, the wall time, the Newton iteration count, the convergence status and
+the final error of the optimisation solver. Each entry is emitted as a JSON line on the
+``telemetry`` logger (failed or slow solves as warnings) and the collected
+entries are available as a table with percentile summaries, so slow or
+failing compositions can be triaged without a profiler.
+"""
+
+import json
+import logging
+import math
+import numbers
+
+import numpy as np
+import pandas as pd
+
+from equilibrium import INPUT_COLUMNS
+
+logger = logging.getLogger("telemetry")
+
+PERCENTILES = [50, 90, 99]
+
+
+class SolveTelemetry:
+    """Collector of per-solve timings and convergence information."""
+
+    def __init__(self, slow_seconds=1.0):
+        self.slow_seconds = slow_seconds
+        self.entries = []
+
+    @staticmethod
+    def error(result):
+        """
+        Final error of the optimisation solver of an ``EquilibriumResult``
+        (NaN when the Reaktoro build does not expose it).
+        """
+        error = getattr(getattr(result, "optima", None), "error", None)
+        return float(error) if error is not None else math.nan
+
+    def record(self, sample, row, result, seconds, warm=False):
+        if isinstance(sample, numbers.Integral):
+            sample = int(sample)
+        elif sample is not None and not isinstance(sample, str):
+            sample = str(sample)
+
+        entry = {
+            "sample": sample,
+            "seconds": seconds,
+            "iterations": int(result.iterations()),
+            "succeeded": bool(result.succeeded()),
+            "error": self.error(result),
+            "warm": warm,
+            "inputs": [float(value) for value in row],
+        }
+        self.entries.append(entry)
+
+        if not entry["succeeded"] or seconds > self.slow_seconds:
+            logger.warning(json.dumps(entry))
+        else:
+            logger.debug(json.dumps(entry))
+
+    def clear(self):
+        self.entries = []
+
+    def to_frame(self):
+        """One row per solve with the inputs split into columns."""
+        frame = pd.DataFrame(self.entries, columns=["sample", "seconds", "iterations",
+                                                   "succeeded", "error", "warm", "inputs"])
+        inputs = pd.DataFrame(frame.pop("inputs").tolist(), columns=INPUT_COLUMNS, index=frame.index)
+        return frame.join(inputs)
+
+    def summary(self):
+        """Count, failures and percentiles of wall time, iterations and solver error."""
+        frame = self.to_frame()
+        rows = {}
+        for column in ["seconds", "iterations", "error"]:
+            values = frame[column].to_numpy(dtype=float)
+            values = values[~np.isnan(values)]
+            stats = {"mean": values.mean() if len(values) else np.nan}
+            for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES) if len(values)
+                                else [np.nan] * len(PERCENTILES)):
+                stats[f"p{p}"] = value
+            stats["max"] = values.max() if len(values) else np.nan
+            rows[column] = stats
+        table = pd.DataFrame(rows).T
+        table.attrs["solves"] = len(frame)
+        table.attrs["failed"] = int((~frame["succeeded"].astype(bool)).sum())
+        return table
+
+    def slowest(self, n=10):
+        """The ``n`` slowest solves, failures first."""
+        return self.to_frame().sort_values(["succeeded", "seconds"], ascending=[True, False]).head(n)
+
+    def write_jsonl(self, path):
+        """Write the structured log, one JSON object per solve."""
+        with open(path, "w") as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry) + "\n")
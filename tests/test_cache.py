@@ -0,0 +1,50 @@
+import pytest
+
+from cache import ResultCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    database = tmp_path / "database.dat"
+    database.write_text("PHASES\n")
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), str(database), max_bytes=10**6)
+    yield cache
+    cache.close()
+
+
+def test_round_trip(cache):
+    key = cache.key([1e-3, 2e-3, 12.5, 25.0, 1.0])
+    cache.put_many([(key, {"csh": 1.5, "succeeded": True})])
+    assert cache.get_many([key, "missing"]) == {key: {"csh": 1.5, "succeeded": True}}
+
+
+def test_key_rounds_inputs_and_separates_engines(cache):
+    row = [1e-3, 2e-3, 12.5]
+    assert cache.key(row) == cache.key([1.0000001e-3, 2e-3, 12.5])
+    assert cache.key(row) != cache.key([1.001e-3, 2e-3, 12.5])
+    assert cache.key(row, "reduced") != cache.key(row)
+
+
+def test_evict_drops_least_recently_used(cache):
+    keys = [cache.key([i]) for i in range(4)]
+    for key in keys:
+        cache.put_many([(key, {"value": "x" * 100})])
+    size = cache.size()
+    cache.get_many(keys[:1])
+
+    cache.max_bytes = size - 1
+    cache.evict()
+    assert set(cache.get_many(keys)) == {keys[0], keys[2], keys[3]}
+    assert cache.size() <= cache.max_bytes
+
+
+def test_entries_of_another_database_are_dropped(tmp_path, cache):
+    key = cache.key([1.0])
+    cache.put_many([(key, {"value": 1})])
+    cache.close()
+
+    other = tmp_path / "other.dat"
+    other.write_text("PHASES\nGp\n")
+    reopened = ResultCache(str(tmp_path / "cache.sqlite"), str(other))
+    assert reopened.get_many([key]) == {}
+    reopened.close()
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlation import MIN_PAIRS, correlate, join_strength
+
+
+def test_correlate_matches_pandas():
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=(30, 4))
+    y = x[:, :1] * [1.0, -0.5, 0.0, 2.0] + rng.normal(size=(30, 4))
+    x[[3, 7], 1] = np.nan
+    y[11, 2] = np.nan
+    result = correlate(x, y)
+
+    for j in range(4):
+        frame = pd.DataFrame({"x": x[:, j], "y": y[:, j]})
+        assert result["n"][j] == len(frame.dropna())
+        assert result["pearson"][j] == pytest.approx(frame["x"].corr(frame["y"]))
+        assert result["spearman"][j] == pytest.approx(frame.dropna().rank().corr().loc["x", "y"])
+        slope, intercept = np.polyfit(*frame.dropna().to_numpy().T, 1)
+        assert result["slope"][j] == pytest.approx(slope)
+        assert result["intercept"][j] == pytest.approx(intercept)
+
+
+def test_correlate_needs_enough_pairs():
+    x = np.array([[1.0], [2.0], [np.nan], [4.0]])
+    y = np.array([[2.0], [1.0], [3.0], [np.nan]])
+    assert MIN_PAIRS > 2
+    result = correlate(x, y)
+    assert result["n"][0] == 2
+    assert np.isnan(result["pearson"][0]) and np.isnan(result["slope"][0])
+
+
+def test_join_strength_by_position():
+    results = pd.DataFrame({"csh_eff": np.arange(4.0)},
+                           index=pd.MultiIndex.from_tuples([("a", 0), ("a", 1), ("a", 2), ("a", 3)]))
+    strength = pd.DataFrame({"A": [1.0, 2.0]})
+    joined = join_strength(results, strength, columns={"a": "A"}, minutes=[0, 30], curing=[0, 15, 30, 60])
+    assert joined.index.tolist() == [("a", 0), ("a", 30)]
+    assert joined["csh_eff"].tolist() == [0.0, 2.0]
+    assert joined["strength"].tolist() == [1.0, 2.0]
+
+
+def test_join_strength_asks_for_minutes_when_positions_run_out():
+    results = pd.DataFrame({"csh_eff": np.arange(3.0)},
+                           index=pd.MultiIndex.from_tuples([("a", 0), ("a", 1), ("a", 2)]))
+    with pytest.raises(ValueError, match="minutes"):
+        join_strength(results, pd.DataFrame({"A": [1.0]}), columns={"a": "A"}, curing=[0, 15])
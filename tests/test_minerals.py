@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from minerals import MINERAL_GROUPS, MineralIndex
+
+
+def test_reduce_matches_original_expressions():
+    index = MineralIndex()
+    rng = np.random.default_rng(0)
+    phase_si = rng.normal(0, 5, size=(20, len(index.phases)))
+    si, eff = index.reduce(phase_si)
+
+    for i, row in enumerate(phase_si):
+        values = dict(zip(index.phases, row))
+        for j, (group, (_, phases)) in enumerate(MINERAL_GROUPS.items()):
+            assert si[i, j] == max(values[phase] for phase in phases)
+            assert eff[i, j] == pytest.approx(max(values[phase] / div for phase, div in phases.items()))
+
+
+def test_reduce_into_preallocated_buffers():
+    index = MineralIndex()
+    phase_si = np.arange(2 * len(index.phases), dtype=float).reshape(2, -1)
+    out = (np.empty((2, len(index.groups)), order="F"), np.empty((2, len(index.groups)), order="F"))
+    si, eff = index.reduce(phase_si, out=out)
+    assert si is out[0] and eff is out[1]
+    np.testing.assert_array_equal(si, index.reduce(phase_si)[0])
+
+
+def test_record_of_one_sample():
+    index = MineralIndex({"a": ("A", {"x": 2, "y": 4}), "b": ("B", {"z": 3})})
+    index.indices = np.array([0, 1, 2])
+
+    class Props:
+        def saturationIndices(self):
+            return type("Vector", (), {"asarray": lambda self: np.array([1.0, 8.0, -3.0])})()
+
+    assert index.record(Props()) == {"a": 8.0, "b": -3.0, "a_eff": 2.0, "b_eff": -1.0}
+
+
+def test_empty_groups_are_rejected():
+    with pytest.raises(ValueError, match="b"):
+        MineralIndex({"a": ("A", {"x": 1}), "b": ("B", {})})
+    with pytest.raises(ValueError):
+        MineralIndex({})
@@ -0,0 +1,30 @@
+import numpy as np
+
+from results import ResultTable
+
+
+def test_to_pandas_shares_buffers():
+    table = ResultTable(3, ["a", "b"], index=["x", "y", "z"])
+    frame = table.to_pandas()
+
+    assert list(frame.columns) == ["a", "b", "a_eff", "b_eff", "pH", "ionic_strength",
+                                   "succeeded", "iterations"]
+    assert np.shares_memory(frame["a"].to_numpy(), table.si)
+    assert np.shares_memory(frame["b_eff"].to_numpy(), table.eff)
+    assert np.shares_memory(frame["pH"].to_numpy(), table.pH)
+    assert np.shares_memory(frame["iterations"].to_numpy(), table.iterations)
+
+
+def test_columns_are_contiguous_views():
+    table = ResultTable(4, ["a", "b"])
+    table.si[:, 1] = [1, 2, 3, 4]
+    column = table.columns()["b"]
+    assert column.flags.c_contiguous
+    np.testing.assert_array_equal(column, [1, 2, 3, 4])
+
+
+def test_extra_columns():
+    table = ResultTable(2, ["a"])
+    saved = table.add_column("saved", np.int32, -1)
+    saved[1] = 5
+    np.testing.assert_array_equal(table.to_pandas()["saved"], [-1, 5])
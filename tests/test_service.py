@@ -0,0 +1,79 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from client import query
+from equilibrium import INPUT_COLUMNS
+from results import ResultTable
+from service import EquilibriumService
+
+
+def _stub_solve(rows):
+    # "csh" echoes the Al input, so every answer can be matched to its request
+    table = ResultTable(len(rows), ["csh"])
+    table.si[:, 0] = rows[:, 0]
+    table.succeeded[:] = True
+    return table
+
+
+def _row(al):
+    return dict(zip(INPUT_COLUMNS, [al, 1e-2, 1e-3, 1e-3, 1e-3, 1e-4, 12.5]))
+
+
+async def _serve(service, path):
+    await service.start()
+    return await asyncio.start_unix_server(service.handle, path)
+
+
+def test_requests_are_batched(tmp_path):
+    path = str(tmp_path / "service.sock")
+    service = EquilibriumService(pool=ThreadPoolExecutor(1), solve=_stub_solve, max_wait=0.05)
+
+    async def run():
+        server = await _serve(service, path)
+        try:
+            answers = await asyncio.gather(*(query([_row(i + 1.0)], path=path) for i in range(8)))
+            metrics = await query(None, path=path, endpoint="/metrics")
+        finally:
+            server.close()
+            await service.stop()
+        return answers, metrics
+
+    answers, metrics = asyncio.run(run())
+    assert [answer[0]["csh"] for answer in answers] == [i + 1.0 for i in range(8)]
+    assert all(answer[0]["succeeded"] for answer in answers)
+    assert metrics["requests"] == 8 and metrics["rows"] == 8
+    assert metrics["batches"] < 8
+
+
+def test_stop_answers_pending_requests_with_503(tmp_path):
+    path = str(tmp_path / "service.sock")
+    release = threading.Event()
+
+    def blocked_solve(rows):
+        release.wait(10)
+        return _stub_solve(rows)
+
+    service = EquilibriumService(pool=ThreadPoolExecutor(1), solve=blocked_solve, max_wait=0.0)
+
+    async def run():
+        server = await _serve(service, path)
+        in_flight = asyncio.create_task(query([_row(1.0)], path=path))
+        await asyncio.sleep(0.1)
+        pending = [asyncio.create_task(query([_row(2.0)], path=path)) for _ in range(2)]
+        await asyncio.sleep(0.1)
+
+        stopping = asyncio.create_task(service.stop())
+        with pytest.raises(RuntimeError, match="503"):
+            await pending[0]
+        with pytest.raises(RuntimeError, match="503"):
+            await pending[1]
+
+        release.set()
+        await stopping
+        server.close()
+        return await in_flight
+
+    assert asyncio.run(run())[0]["csh"] == 1.0
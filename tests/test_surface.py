@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from surface import AXES, SISurface
+
+
+def _linear_surface():
+    grid = [np.array([-6.0, -4.0, -2.0]), np.array([-3.0, -1.0]), np.array([-5.0, -4.0, -3.0]),
+            np.array([-4.0, -2.0]), np.array([11.0, 12.0, 13.0])]
+    coefficients = np.array([[1.0, -2.0], [0.5, 3.0], [-1.0, 0.0], [2.0, 1.0], [0.25, -0.5]])
+    points = np.stack(np.meshgrid(*grid, indexing="ij"), axis=-1)
+    values = points @ coefficients + [1.0, -1.0]
+    surface = SISurface(grid, values, {"K": 0.01, "Na": 0.02}, columns=["a", "a_eff"])
+    return surface, coefficients
+
+
+def test_linear_interpolation_is_exact_on_a_linear_field():
+    surface, coefficients = _linear_surface()
+    rng = np.random.default_rng(1)
+    low = [axis[0] for axis in surface.grid]
+    high = [axis[-1] for axis in surface.grid]
+    coordinates = rng.uniform(low, high, size=(50, len(AXES)))
+
+    np.testing.assert_allclose(surface._linear(coordinates), coordinates @ coefficients + [1.0, -1.0])
+
+
+def test_linear_interpolation_at_grid_nodes():
+    surface, _ = _linear_surface()
+    first = [axis[0] for axis in surface.grid]
+    last = [axis[-1] for axis in surface.grid]
+    np.testing.assert_allclose(surface._linear(np.array([first, last])),
+                               [surface.values[(0,) * 5], surface.values[(-1,) * 5]])
+
+
+def test_query_without_engine():
+    surface, coefficients = _linear_surface()
+    df = pd.DataFrame({"Al": [1e-5, 1e-5, 1e-9], "Ca": [1e-2, 1e-2, 1e-2], "Si": [1e-4] * 3,
+                       "S": [1e-3] * 3, "pH": [12.0] * 3, "K": [0.01, 0.05, 0.01], "Na": [0.02] * 3})
+    result = surface.query(df)
+
+    assert result["source"].tolist() == ["surface", "fixed", "outside"]
+    assert np.isnan(result["a"].iloc[2])
+    expected = np.array([-5.0, -2.0, -4.0, -3.0, 12.0]) @ coefficients + [1.0, -1.0]
+    np.testing.assert_allclose(result[["a", "a_eff"]].iloc[0], expected)